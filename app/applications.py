@@ -8,12 +8,17 @@ from prometheus_client.exposition import make_asgi_app
 from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
 from starlette_prometheus import PrometheusMiddleware
 
+from app.kafka.outbox_relay import OutboxRelay
 from app.kafka.producer import KafkaProducer
 from app.routers.default_router import DefaultRouter
 from app.routers.tariff_router import TariffRouter
+from app.services.import_job_service import ImportJobService
+from app.services.rate_sync import RateSync
+from app.services.tariff_service import TariffService
 from app.settings import AppConfig
 from app.utils.db import Db
-from app.utils.logger_config import logger as custom_logger
+from app.utils.logger_config import add_queued_sink, configure_logging, shutdown_logging
+from app.utils.tracing import configure_tracing, shutdown_tracing
 
 
 class Application:
@@ -24,24 +29,43 @@ class Application:
         default: DefaultRouter,
         rate: TariffRouter,
         kafka_producer: KafkaProducer,
+        import_job_service: ImportJobService,
+        outbox_relay: OutboxRelay,
+        tariff_service: TariffService,
+        rate_sync: RateSync,
     ):
         self._config = config
         self._db = db
         self._default = default
         self._rate = rate
         self._kafka_producer = kafka_producer
+        self._import_job_service = import_job_service
+        self._outbox_relay = outbox_relay
+        self._tariff_service = tariff_service
+        self._rate_sync = rate_sync
 
     @asynccontextmanager
     async def lifespan(self, server: FastAPI):
         # Startup
         await self._db.start()
+        # Снимок ставок грузится в фоне, /default/ready ждёт его загрузки
+        self._rate_sync.start()
         await self._kafka_producer.start()
+        self._outbox_relay.start()
         yield
         # Shutdown
+        await self._rate_sync.stop()
+        await self._import_job_service.shutdown()
+        await self._outbox_relay.stop()
+        self._tariff_service.shutdown()
         await self._db.shutdown()
         await self._kafka_producer.stop()
+        await shutdown_tracing()
+        await shutdown_logging()
 
     def setup(self, server: FastAPI) -> None:
+        configure_logging(self._config.logging, self._config.tg)
+
         @server.get("/favicon.ico")
         async def _favicon():
             return FileResponse("favicon.ico")
@@ -58,7 +82,9 @@ class Application:
         if self._config.sentry_dsn and self._config.environment != "test":
             sentry_sdk.init(self._config.sentry_dsn)
             server.add_middleware(SentryAsgiMiddleware)
-            custom_logger.add(self._sentry_handler, level="ERROR")
+            add_queued_sink("sentry", self._sentry_handler, self._config.logging)
+
+        configure_tracing(self._config.tracing)
 
         server.add_middleware(PrometheusMiddleware, filter_unhandled_paths=True)
         server.mount("/metrics", make_asgi_app())
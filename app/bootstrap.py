@@ -1,12 +1,27 @@
 from loguru import logger
 from punq import Container, Scope
 
+from app.kafka.outbox_relay import OutboxRelay
 from app.kafka.producer import KafkaProducer
+from app.repositories.outbox_repository import OutboxRepo
 from app.repositories.tariff_repository import TariffRepo
 from app.routers.default_router import DefaultRouter
 from app.routers.tariff_router import TariffRouter
+from app.services.import_job_service import ImportJobService
+from app.services.rate_cache import RateCache
+from app.services.rate_index import RateIndex
+from app.services.rate_sync import RateSync
+from app.services.recent_imports import RecentImports
+from app.services.tariff_parse_pool import TariffParsePool
 from app.services.tariff_service import TariffService
-from app.settings import AppConfig
+from app.settings import (
+    AppConfig,
+    ImportJobConfig,
+    LoggingConfig,
+    OutboxConfig,
+    RateSyncConfig,
+    TariffImportConfig,
+)
 from app.utils.db import Db
 
 
@@ -15,6 +30,11 @@ def bootstrap(app_config: AppConfig) -> Container:
 
     try:
         container.register(AppConfig, instance=app_config)
+        container.register(TariffImportConfig, instance=app_config.tariff_import)
+        container.register(ImportJobConfig, instance=app_config.import_jobs)
+        container.register(OutboxConfig, instance=app_config.outbox)
+        container.register(LoggingConfig, instance=app_config.logging)
+        container.register(RateSyncConfig, instance=app_config.rate_sync)
 
         smit_db = Db(app_config.db)
         container.register(Db, instance=smit_db, scope=Scope.singleton)
@@ -22,6 +42,14 @@ def bootstrap(app_config: AppConfig) -> Container:
         kafka_producer = KafkaProducer(
             bootstrap_servers=app_config.kafka.bootstrap_servers,
             default_topic=app_config.kafka.topik,
+            batch_size=app_config.kafka.batch_size,
+            linger_ms=app_config.kafka.linger_ms,
+            max_batch_size=app_config.kafka.max_batch_size,
+            compression_type=app_config.kafka.compression_type,
+            queue_size=app_config.kafka.queue_size,
+            flush_interval=app_config.kafka.flush_interval,
+            backpressure=app_config.kafka.backpressure,
+            spill_path=app_config.kafka.spill_path,
         )
         container.register(
             KafkaProducer,
@@ -29,11 +57,36 @@ def bootstrap(app_config: AppConfig) -> Container:
             scope=Scope.singleton,
         )
 
+        rate_cache = RateCache(
+            max_size=app_config.rate_cache.max_size,
+            ttl=app_config.rate_cache.ttl,
+        )
+        container.register(RateCache, instance=rate_cache, scope=Scope.singleton)
+        container.register(RateIndex, instance=RateIndex(), scope=Scope.singleton)
+        container.register(TariffParsePool, TariffParsePool, scope=Scope.singleton)
+        recent_imports = RecentImports(
+            max_size=app_config.tariff_import.recent_imports_max_size,
+            ttl=app_config.tariff_import.recent_imports_ttl,
+        )
+        container.register(
+            RecentImports,
+            instance=recent_imports,
+            scope=Scope.singleton,
+        )
+
         container.register(DefaultRouter, DefaultRouter)
         container.register(TariffRouter, TariffRouter)
 
-        container.register(TariffService, TariffService)
+        container.register(TariffService, TariffService, scope=Scope.singleton)
+        container.register(
+            ImportJobService,
+            ImportJobService,
+            scope=Scope.singleton,
+        )
         container.register(TariffRepo, TariffRepo)
+        container.register(OutboxRepo, OutboxRepo)
+        container.register(OutboxRelay, OutboxRelay, scope=Scope.singleton)
+        container.register(RateSync, RateSync, scope=Scope.singleton)
     except Exception as e:
         logger.error(f"Error during bootstrap: {e}")
         raise
@@ -0,0 +1,29 @@
+from datetime import date, datetime
+from typing import Any
+
+from app.models.action_type import ActionType
+
+
+def create_message(
+    action: ActionType,
+    user_id: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "action": action.value,
+        "timestamp": str(datetime.now()),
+    }
+
+
+def create_tariff_change_message(
+    action: ActionType,
+    published_at: date,
+    category_type: str,
+    rate: float | None = None,
+) -> dict[str, Any]:
+    """Изменение одной категории тарифа на дату; у удаления ставки нет."""
+    message = create_message(action)
+    message["published_at"] = published_at.isoformat()
+    message["category_type"] = category_type
+    message["rate"] = rate
+    return message
@@ -0,0 +1,51 @@
+import asyncio
+
+from loguru import logger
+
+from app.kafka.producer import KafkaProducer
+from app.repositories.outbox_repository import OutboxRepo
+from app.settings import OutboxConfig
+
+
+class OutboxRelay:
+    """Фоновая отправка событий из таблицы outbox в Kafka."""
+
+    def __init__(
+        self,
+        outbox_repo: OutboxRepo,
+        kafka_producer: KafkaProducer,
+        config: OutboxConfig,
+    ):
+        self._outbox_repo = outbox_repo
+        self._kafka_producer = kafka_producer
+        self._config = config
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def relay_once(self) -> int:
+        return await self._outbox_repo.publish_batch(
+            self._config.batch_size,
+            self._kafka_producer.send_messages,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                published = await self.relay_once()
+            except Exception as e:
+                logger.exception(f"Failed to relay outbox events: {e}")
+                published = 0
+
+            if published:
+                logger.info(f"Relayed {published} outbox events to Kafka.")
+            if published < self._config.batch_size:
+                await asyncio.sleep(self._config.poll_interval)
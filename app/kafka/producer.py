@@ -1,21 +1,74 @@
+import asyncio
 import json
+import os
+import shutil
+import time
 from typing import Any
 
 from aiokafka import AIOKafkaProducer
 from aiokafka.admin import AIOKafkaAdminClient, NewTopic
 from loguru import logger
 
-from app.settings import APP_CONFIG
+from app.settings import APP_CONFIG, KafkaBackpressure
+from app.utils.metrics import (
+    KAFKA_PRODUCER_DROPPED,
+    KAFKA_PRODUCER_FLUSH_SECONDS,
+    KAFKA_PRODUCER_QUEUE_DEPTH,
+    KAFKA_PRODUCER_SPILLED,
+    KAFKA_SEND_BATCH_SECONDS,
+    KAFKA_SEND_BATCH_SIZE,
+)
+from app.utils.tracing import TRACEPARENT_HEADER, tracer
+
+# (сообщение, traceparent спана, в котором оно создано)
+QueuedMessage = tuple[bytes, str | None]
 
 
 class KafkaProducer:
-    def __init__(self, bootstrap_servers: str, default_topic: str = "default_actions"):
+    """
+    Сообщения складываются в ограниченную очередь, а фоновая задача отправляет
+    их пачками: как только набралось ``batch_size`` сообщений или прошло
+    ``flush_interval`` секунд. Поведение при переполнении очереди задаётся
+    ``backpressure``: ждать места, выкинуть самое старое сообщение или
+    дописать сообщение в файл ``spill_path`` до освобождения очереди.
+
+    Пачка, которую не удалось отправить, тоже уходит в ``spill_path`` и
+    повторяется, когда очередь опустеет. Сообщения из пачки, успевшие дойти
+    до брокера, при этом отправятся повторно.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        default_topic: str = "default_actions",
+        batch_size: int = APP_CONFIG.kafka.batch_size,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        compression_type: str | None = None,
+        queue_size: int = 10_000,
+        flush_interval: float = 0.5,
+        backpressure: KafkaBackpressure = KafkaBackpressure.block,
+        spill_path: str = "kafka_spill.jsonl",
+    ):
         self.bootstrap_servers = bootstrap_servers
         self.producer: AIOKafkaProducer | None = None
         self.admin_client: AIOKafkaAdminClient | None = None
-        self.batch_size = APP_CONFIG.kafka.batch_size
-        self.batches: dict[str, list[bytes]] = {}
+        self.batch_size = batch_size
+        self.batches: dict[str, list[QueuedMessage]] = {}
         self.default_topic = default_topic
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self.compression_type = compression_type
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.spill_path = spill_path
+        self._queue: asyncio.Queue[tuple[str, QueuedMessage]] = asyncio.Queue(
+            queue_size,
+        )
+        self._flusher: asyncio.Task | None = None
+        # Файл пишется в отдельном потоке, не даём записям перемешаться
+        self._spill_lock = asyncio.Lock()
+        KAFKA_PRODUCER_QUEUE_DEPTH.set_function(self._queue.qsize)
 
     async def start(self) -> None:
         self.admin_client = AIOKafkaAdminClient(
@@ -37,14 +90,33 @@ class KafkaProducer:
             bootstrap_servers=self.bootstrap_servers,
             acks="all",
             enable_idempotence=True,
+            linger_ms=self.linger_ms,
+            max_batch_size=self.max_batch_size,
+            compression_type=self.compression_type,
         )
         await self.producer.start()
         logger.info("Kafka producer connected to %s", self.bootstrap_servers)
+        self.start_flusher()
+
+    def start_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
 
     async def stop(self) -> None:
-        for topic, batch in self.batches.items():
-            if batch:
-                await self.send_batch(topic)
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+
+        while True:
+            while not self._queue.empty():
+                topic, message = self._queue.get_nowait()
+                self.batches.setdefault(topic, []).append(message)
+            if not os.path.exists(self.spill_path):
+                break
+            await self._replay_spill()
+        await self._flush()
+
         if self.producer is not None:
             await self.producer.stop()
             logger.info("Kafka producer disconnected")
@@ -59,13 +131,50 @@ class KafkaProducer:
         if topic is None:
             topic = self.default_topic
 
-        if topic not in self.batches:
-            self.batches[topic] = []
+        item = (
+            topic,
+            (json.dumps(message).encode("utf-8"), tracer.current_traceparent()),
+        )
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+        elif self.backpressure is KafkaBackpressure.drop_oldest:
+            self._queue.get_nowait()
+            self._queue.put_nowait(item)
+            KAFKA_PRODUCER_DROPPED.labels(reason="queue_full").inc()
+        elif self.backpressure is KafkaBackpressure.spill:
+            await self._spill([item], reason="queue_full")
+        else:
+            await self._queue.put(item)
+
+    async def send_messages(
+        self,
+        messages: list[tuple[str | None, dict[str, Any], str | None]],
+    ) -> None:
+        """
+        Отправка в обход очереди с ожиданием подтверждения брокера. Элементы -
+        (топик, сообщение, traceparent).
+        """
+        if self.producer is None:
+            raise RuntimeError(
+                "Producer is not initialized. Call start() before sending messages",
+            )
 
-        self.batches[topic].append(json.dumps(message).encode("utf-8"))
+        with tracer.span("kafka.send_messages", messages=len(messages)):
+            futures = [
+                await self.producer.send(
+                    topic or self.default_topic,
+                    json.dumps(message).encode("utf-8"),
+                    headers=self._headers(traceparent),
+                )
+                for topic, message, traceparent in messages
+            ]
+            await asyncio.gather(*futures)
 
-        if len(self.batches[topic]) >= self.batch_size:
-            await self.send_batch(topic)
+    @staticmethod
+    def _headers(traceparent: str | None) -> list[tuple[str, bytes]] | None:
+        if traceparent is None:
+            return None
+        return [(TRACEPARENT_HEADER, traceparent.encode())]
 
     async def send_batch(self, topic: str) -> None:
         if topic in self.batches and self.batches[topic]:
@@ -74,9 +183,147 @@ class KafkaProducer:
                     "Producer is not initialized. Call start() before sending messages",
                 )
 
-            for message in self.batches[topic]:
-                await self.producer.send_and_wait(topic, message)
+            messages, self.batches[topic] = self.batches[topic], []
+            KAFKA_SEND_BATCH_SIZE.observe(len(messages))
+            with (
+                KAFKA_SEND_BATCH_SECONDS.time(),
+                tracer.span("kafka.send_batch", topic=topic, messages=len(messages)),
+            ):
+                # send() только кладёт сообщение в буфер aiokafka, ждём
+                # подтверждения брокера сразу для всей пачки
+                futures = [
+                    await self.producer.send(
+                        topic,
+                        message,
+                        headers=self._headers(traceparent),
+                    )
+                    for message, traceparent in messages
+                ]
+                await asyncio.gather(*futures)
             logger.info(
-                f"Batch of {len(self.batches[topic])} messages sent to Kafka topic '{topic}.'",  # noqa: E501
+                f"Batch of {len(messages)} messages sent to Kafka topic '{topic}.'",
             )
-            self.batches[topic].clear()
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            topic, message = await self._queue.get()
+            self.batches.setdefault(topic, []).append(message)
+            collected = 1
+            deadline = loop.time() + self.flush_interval
+
+            while collected < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    topic, message = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                self.batches.setdefault(topic, []).append(message)
+                collected += 1
+
+            await self._flush()
+            if self._queue.empty():
+                try:
+                    await self._replay_spill()
+                except Exception as e:
+                    # Файл остаётся на месте, повторим после следующей пачки
+                    logger.exception(f"Failed to replay spilled Kafka messages: {e}")
+
+    async def _flush(self) -> None:
+        for topic, batch in self.batches.items():
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            try:
+                await self.send_batch(topic)
+            except Exception as e:
+                logger.exception(
+                    f"Failed to send {len(batch)} messages to '{topic}', "
+                    f"spilling them for retry: {e}",
+                )
+                self.batches[topic] = []
+                try:
+                    await self._spill(
+                        [(topic, message) for message in batch],
+                        reason="send_error",
+                    )
+                except Exception as e:
+                    KAFKA_PRODUCER_DROPPED.labels(reason="spill_error").inc(len(batch))
+                    logger.exception(f"Failed to spill {len(batch)} messages: {e}")
+            else:
+                KAFKA_PRODUCER_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+    async def _spill(self, items: list[tuple[str, QueuedMessage]], reason: str) -> None:
+        async with self._spill_lock:
+            await asyncio.to_thread(self._write_spill, items)
+        KAFKA_PRODUCER_SPILLED.labels(reason=reason).inc(len(items))
+
+    async def _replay_spill(self) -> None:
+        async with self._spill_lock:
+            items = await asyncio.to_thread(self._take_spilled, self._free_slots())
+        if not items:
+            return
+
+        # Пока файл читался, очередь могла заполниться новыми сообщениями
+        free = self._free_slots()
+        for item in items[:free]:
+            self._queue.put_nowait(item)
+        if free is not None and len(items) > free:
+            await self._spill(items[free:], reason="queue_full")
+        logger.info("Spilled Kafka messages returned to the queue.")
+
+    def _free_slots(self) -> int | None:
+        """Свободные места в очереди, ``None`` - очередь без ограничения."""
+        if self._queue.maxsize <= 0:
+            return None
+        return self._queue.maxsize - self._queue.qsize()
+
+    def _write_spill(self, items: list[tuple[str, QueuedMessage]]) -> None:
+        with open(self.spill_path, "a", encoding="utf-8") as spill:
+            for topic, (message, traceparent) in items:
+                spill.write(
+                    json.dumps(
+                        {
+                            "topic": topic,
+                            "message": message.decode(),
+                            "traceparent": traceparent,
+                        },
+                    ),
+                )
+                spill.write("\n")
+
+    def _take_spilled(self, limit: int | None) -> list[tuple[str, QueuedMessage]]:
+        """Забирает из файла не больше ``limit`` сообщений, остальные оставляет."""
+        spilled_path = f"{self.spill_path}.replay"
+        # Файл .replay остаётся, если прошлый повтор прервался ошибкой
+        if not os.path.exists(spilled_path):
+            if not os.path.exists(self.spill_path):
+                return []
+            os.replace(self.spill_path, spilled_path)
+
+        items: list[tuple[str, QueuedMessage]] = []
+        with open(spilled_path, encoding="utf-8") as spilled:
+            for line in spilled:
+                if limit is not None and len(items) >= limit:
+                    with open(self.spill_path, "a", encoding="utf-8") as spill:
+                        spill.write(line)
+                        shutil.copyfileobj(spilled, spill)
+                    break
+                try:
+                    item = json.loads(line)
+                    items.append(
+                        (
+                            item["topic"],
+                            (item["message"].encode("utf-8"), item.get("traceparent")),
+                        ),
+                    )
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    KAFKA_PRODUCER_DROPPED.labels(reason="corrupt_spill").inc()
+                    logger.warning(
+                        f"Skipped corrupt line in Kafka spill file: {line!r}"
+                    )
+        os.remove(spilled_path)
+        return items
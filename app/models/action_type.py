@@ -4,5 +4,9 @@ from enum import Enum
 class ActionType(str, Enum):
     CREATE_TARIFF = "create_tariff"
     CALCULATE_INSURANCE_COST = "calculate_insurance_cost"
+    CALCULATE_INSURANCE_COST_BATCH = "calculate_insurance_cost_batch"
     UPDATE_TARIFF = "update_tariff"
     DELETE_TARIFF = "delete_tariff"
+    TARIFF_CATEGORY_ADDED = "tariff_category_added"
+    TARIFF_CATEGORY_UPDATED = "tariff_category_updated"
+    TARIFF_CATEGORY_REMOVED = "tariff_category_removed"
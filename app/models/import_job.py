@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, computed_field, Field
+
+
+class ImportJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(BaseModel):
+    id: UUID
+    filename: str | None = None
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    dates_processed: int = Field(default=0, description="Записано дат")
+    tariffs_processed: int = Field(default=0, description="Записано тарифов")
+    bytes_processed: int = Field(default=0, description="Прочитано байт файла")
+    errors: list[str] = []
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @computed_field(description="Тарифов в секунду")  # type: ignore[misc]
+    @property
+    def throughput(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (
+            (self.finished_at or datetime.now()) - self.started_at
+        ).total_seconds()
+        return self.tariffs_processed / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ImportMode(str, Enum):
+    DEFAULT = "default"
+    BULK = "bulk"
+    UPSERT = "upsert"
+    DELTA = "delta"
@@ -24,6 +24,42 @@ class TariffResponse(BaseModel):
     tariffs: list[TariffBase]
 
 
+class TariffRecord(TariffBase):
+    id: UUID
+    published_at: date = Field(description="Дата публикации тарифа")
+
+
+class TariffPage(BaseModel):
+    items: list[TariffRecord]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Курсор следующей страницы, None - страница последняя",
+    )
+
+
+class TariffImportSummary(BaseModel):
+    dates: int = Field(ge=0, description="Количество загруженных дат")
+    tariffs: int = Field(ge=0, description="Количество загруженных тарифов")
+
+
+class TariffUpsertSummary(BaseModel):
+    content_hash: str = Field(description="SHA-256 содержимого загрузки")
+    inserted: int = Field(ge=0, description="Количество добавленных тарифов")
+    updated: int = Field(ge=0, description="Количество тарифов с новой ставкой")
+    unchanged: int = Field(ge=0, description="Количество тарифов без изменений")
+    duplicate: bool = Field(
+        default=False,
+        description="Эта загрузка уже применялась, БД не затрагивалась",
+    )
+
+
+class TariffDeltaSummary(BaseModel):
+    inserted: int = Field(ge=0, description="Количество добавленных тарифов")
+    updated: int = Field(ge=0, description="Количество тарифов с новой ставкой")
+    removed: int = Field(ge=0, description="Количество удалённых тарифов")
+    unchanged: int = Field(ge=0, description="Количество тарифов без изменений")
+
+
 class InsuranceCostBase(BaseModel):
     declared_value: float = Field(ge=0, description="Объявленная стоимость")
     category_type: str = Field(max_length=20, description="Категория тарифа")
@@ -37,3 +73,7 @@ class InsuranceCostRequest(InsuranceCostBase):
 class InsuranceCostResponse(InsuranceCostBase):
     rate: float = Field(ge=0, le=1, description="Рейтинг тарифа")
     insurance_cost: float = Field(ge=0, description="Стоимость страхования")
+    rate_published_at: date | None = Field(
+        default=None,
+        description="Дата публикации применённого тарифа",
+    )
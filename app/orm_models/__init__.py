@@ -4,3 +4,4 @@
 from app.orm_models.uuid_mixin import *
 from app.orm_models.tariff import *
 from app.orm_models.date_accession import *
+from app.orm_models.outbox_event import *
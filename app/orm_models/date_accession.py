@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, func
+from sqlalchemy import Date, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app import orm_models
@@ -10,6 +10,9 @@ from app.utils.db import Base
 
 class DateAccession(IdMixin, Base):
     __tablename__ = "date_accessions"  # type: ignore
+    __table_args__ = (
+        UniqueConstraint("published_at", name="uq_date_accessions_published_at"),
+    )
 
     published_at: Mapped[date] = mapped_column(
         Date,
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, func, Integer, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.utils.db import Base
+
+
+class OutboxEvent(Base):
+    """Событие для Kafka, записанное в одной транзакции с изменением тарифов."""
+
+    __tablename__ = "outbox"  # type: ignore
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    topic: Mapped[str | None] = mapped_column(String(255))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    # Контекст трассировки запроса, создавшего событие (W3C traceparent)
+    traceparent: Mapped[str | None] = mapped_column(String(55))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+    )
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Float, ForeignKey, String
+from sqlalchemy import Float, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app import orm_models
@@ -10,6 +10,14 @@ from app.utils.db import Base
 
 class Tariff(IdMixin, Base):
     __tablename__ = "tariffs"  # type: ignore
+    # Одна категория на дату; индекс заодно покрывает поиск в get_tariff
+    __table_args__ = (
+        UniqueConstraint(
+            "date_accession_id",
+            "category_type",
+            name="uq_tariffs_date_accession_id_category_type",
+        ),
+    )
 
     category_type: Mapped[str] = mapped_column(String(32))
     rate: Mapped[float] = mapped_column(Float)
@@ -0,0 +1,48 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import delete, select
+
+from app.orm_models import OutboxEvent
+from app.utils.db import Db
+
+# (топик, сообщение, traceparent)
+OutboxMessage = tuple[str | None, dict[str, Any], str | None]
+
+
+class OutboxRepo:
+    def __init__(self, db: Db):
+        self._db = db
+
+    async def publish_batch(
+        self,
+        batch_size: int,
+        publish: Callable[[list[OutboxMessage]], Awaitable[None]],
+    ) -> int:
+        """
+        Забирает до ``batch_size`` событий, передаёт их в ``publish`` и удаляет
+        после успешной отправки. ``FOR UPDATE SKIP LOCKED`` не даёт нескольким
+        репликам взять одни и те же строки.
+        """
+        async with self._db.get_session() as session:
+            result = await session.execute(
+                select(
+                    OutboxEvent.id,
+                    OutboxEvent.topic,
+                    OutboxEvent.payload,
+                    OutboxEvent.traceparent,
+                )
+                .order_by(OutboxEvent.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True),
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            await publish([(row.topic, row.payload, row.traceparent) for row in rows])
+            await session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])),
+            )
+            await session.commit()
+            return len(rows)
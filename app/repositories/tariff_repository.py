@@ -1,74 +1,815 @@
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
 from datetime import date
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+import orjson
+from sqlalchemy import (
+    any_,
+    bindparam,
+    Boolean,
+    column,
+    delete,
+    Float,
+    func,
+    insert,
+    literal_column,
+    Row,
+    select,
+    Select,
+    String,
+    Text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.kafka.messages import create_message, create_tariff_change_message
+from app.models.action_type import ActionType
 from app.models.tariff import TariffBase
-from app.orm_models import DateAccession, Tariff
+from app.orm_models import DateAccession, OutboxEvent, Tariff
 from app.utils.db import Db
+from app.utils.metrics import TARIFF_REPO_SECONDS, timed
+from app.utils.tracing import traced, tracer
+
+
+@dataclass(slots=True, frozen=True)
+class TariffRow:
+    """
+    Тариф для чтения. Запросы выбирают только нужные колонки, без ORM-объектов,
+    identity map и загрузки связей.
+    """
+
+    id: UUID
+    published_at: date
+    category_type: str
+    rate: float
+
+
+# Изменение ставки (published_at, category_type, rate); rate None - удаление
+RateChange = tuple[date, str, float | None]
+
+# Канал NOTIFY изменений ставок, см. RateSync
+RATE_CHANGES_CHANNEL = "tariff_rate_changes"
+# Строк в одном уведомлении: payload NOTIFY ограничен 8000 байтами
+RATE_CHANGES_PER_NOTIFY = 100
+# Отправитель уведомлений: свои изменения процесс уже применил сам
+PROCESS_ORIGIN = uuid4().hex
+
+
+def rate_change_payloads(
+    changes: list[RateChange],
+    origin: str = PROCESS_ORIGIN,
+) -> list[str]:
+    """
+    Payload-ы NOTIFY: {"origin": ..., "changes": [[дата, категория, ставка]]}.
+    """
+    return [
+        orjson.dumps(
+            {
+                "origin": origin,
+                "changes": [
+                    (published_at.isoformat(), category_type, rate)
+                    for published_at, category_type, rate in changes[
+                        start : start + RATE_CHANGES_PER_NOTIFY
+                    ]
+                ],
+            },
+        ).decode()
+        for start in range(0, len(changes), RATE_CHANGES_PER_NOTIFY)
+    ]
+
+
+def parse_rate_changes(payload: str) -> tuple[str, list[RateChange]]:
+    """Отправитель и изменения из payload ``rate_change_payloads``."""
+    data = orjson.loads(payload)
+    return data["origin"], [
+        (date.fromisoformat(published_at), category_type, rate)
+        for published_at, category_type, rate in data["changes"]
+    ]
+
+
+@dataclass(slots=True, frozen=True)
+class TariffUpsertRow:
+    """Тариф, добавленный (``inserted``) или изменённый upsert-загрузкой."""
+
+    published_at: date
+    category_type: str
+    rate: float
+    inserted: bool
+
+
+TARIFF_ROW_COLUMNS = (
+    Tariff.id,
+    DateAccession.published_at,
+    Tariff.category_type,
+    Tariff.rate,
+)
+
+# Выражения строятся один раз при импорте, значения передаются параметрами.
+# Так SQLAlchemy не собирает конструкцию заново на каждый вызов, а одинаковый
+# SQL переиспользует и свой кэш компиляции, и prepared statements asyncpg.
+# query_name - имя запроса в метриках и хуках профилирования Db.
+
+INSERT_OUTBOX_EVENTS = insert(OutboxEvent).execution_options(
+    query_name="insert_outbox_events",
+)
+
+# Уведомления доставляются слушателям при commit транзакции
+_rate_change_payloads = (
+    func.unnest(
+        bindparam("payloads", type_=ARRAY(Text)),
+    )
+    .table_valued(column("payload", Text))
+    .render_derived(name="changes")
+)
+NOTIFY_RATE_CHANGES = select(
+    func.pg_notify(RATE_CHANGES_CHANNEL, _rate_change_payloads.c.payload),
+).execution_options(query_name="notify_rate_changes")
+
+_insert_date_accessions = pg_insert(DateAccession)
+UPSERT_DATE_ACCESSIONS = (
+    _insert_date_accessions.on_conflict_do_update(
+        index_elements=[DateAccession.published_at],
+        set_={"published_at": _insert_date_accessions.excluded.published_at},
+    )
+    .returning(DateAccession.published_at, DateAccession.id)
+    .execution_options(query_name="upsert_date_accessions")
+)
+
+INSERT_TARIFFS = insert(Tariff).execution_options(query_name="insert_tariffs")
+
+# Строка без изменения ставки не обновляется и не попадает в RETURNING.
+# xmax = 0 только у только что вставленной версии строки
+_insert_tariffs = pg_insert(Tariff)
+UPSERT_TARIFFS = (
+    _insert_tariffs.on_conflict_do_update(
+        constraint="uq_tariffs_date_accession_id_category_type",
+        set_={"rate": _insert_tariffs.excluded.rate},
+        where=Tariff.rate.is_distinct_from(_insert_tariffs.excluded.rate),
+    )
+    .returning(
+        Tariff.date_accession_id,
+        Tariff.category_type,
+        Tariff.rate,
+        literal_column("xmax = 0", Boolean).label("inserted"),
+    )
+    .execution_options(query_name="upsert_tariffs")
+)
+
+# Ставки файла, отличающиеся от БД: один запрос сравнивает весь файл, и
+# upsert получает только изменённые строки. Без этого ON CONFLICT DO UPDATE
+# блокирует каждую существующую строку, даже если ставка та же, и пишет
+# блокировку в WAL
+_incoming_tariffs = (
+    func.unnest(
+        bindparam("accession_ids", type_=ARRAY(Tariff.date_accession_id.type)),
+        bindparam("category_types", type_=ARRAY(String)),
+        bindparam("rates", type_=ARRAY(Float)),
+    )
+    .table_valued(
+        column("date_accession_id", Tariff.date_accession_id.type),
+        column("category_type", String),
+        column("rate", Float),
+    )
+    .render_derived(name="incoming")
+)
+DIFF_TARIFFS = (
+    select(
+        _incoming_tariffs.c.date_accession_id,
+        _incoming_tariffs.c.category_type,
+        _incoming_tariffs.c.rate,
+    )
+    .outerjoin(
+        Tariff,
+        (Tariff.date_accession_id == _incoming_tariffs.c.date_accession_id)
+        & (Tariff.category_type == _incoming_tariffs.c.category_type),
+    )
+    .where(Tariff.rate.is_distinct_from(_incoming_tariffs.c.rate))
+    .execution_options(query_name="diff_tariffs")
+)
+
+# Категории дат файла, которых в файле нет. Ключи файла передаются двумя
+# массивами, а не списком параметров: число дат и категорий не ограничено
+# лимитом параметров запроса
+_accession_ids = bindparam("accession_ids", type_=ARRAY(Tariff.date_accession_id.type))
+DELETE_MISSING_TARIFFS = (
+    delete(Tariff)
+    .where(Tariff.date_accession_id == any_(_accession_ids))
+    .where(
+        tuple_(Tariff.date_accession_id, Tariff.category_type).not_in(
+            select(
+                func.unnest(bindparam("keep_accession_ids", type_=_accession_ids.type)),
+                func.unnest(bindparam("keep_category_types", type_=ARRAY(String))),
+            ),
+        ),
+    )
+    .returning(Tariff.date_accession_id, Tariff.category_type)
+    .execution_options(query_name="delete_missing_tariffs")
+)
+
+GET_TARIFF = (
+    select(*TARIFF_ROW_COLUMNS)
+    .join(DateAccession)
+    .where(DateAccession.published_at == bindparam("published_at"))
+    .where(Tariff.category_type == bindparam("category_type"))
+    .execution_options(query_name="get_tariff")
+)
+
+GET_RATE = (
+    select(Tariff.rate)
+    .join(DateAccession)
+    .where(DateAccession.published_at == bindparam("published_at"))
+    .where(Tariff.category_type == bindparam("category_type"))
+    .execution_options(query_name="get_rate")
+)
+
+GET_RATES = (
+    select(DateAccession.published_at, Tariff.category_type, Tariff.rate)
+    .join(DateAccession)
+    .where(
+        tuple_(DateAccession.published_at, Tariff.category_type).in_(
+            bindparam("keys", expanding=True),
+        ),
+    )
+    .execution_options(query_name="get_rates")
+)
+
+GET_RATE_AS_OF = (
+    select(DateAccession.published_at, Tariff.rate)
+    .join(DateAccession)
+    .where(DateAccession.published_at <= bindparam("published_at"))
+    .where(Tariff.category_type == bindparam("category_type"))
+    .order_by(DateAccession.published_at.desc())
+    .limit(1)
+    .execution_options(query_name="get_rate_as_of")
+)
+
+ITER_RATES = (
+    select(DateAccession.published_at, Tariff.category_type, Tariff.rate)
+    .join(DateAccession)
+    .order_by(Tariff.category_type, DateAccession.published_at)
+    .execution_options(query_name="iter_rates")
+)
+
+GET_TARIFF_BY_ID = (
+    select(*TARIFF_ROW_COLUMNS)
+    .join(DateAccession)
+    .where(Tariff.id == bindparam("tariff_id"))
+    .execution_options(query_name="get_tariff_by_id")
+)
+
+_old_tariff = (
+    select(Tariff.id, Tariff.category_type)
+    .where(Tariff.id == bindparam("tariff_id"))
+    .with_for_update()
+    .subquery()
+)
+UPDATE_TARIFF = (
+    update(Tariff)
+    .where(Tariff.id == _old_tariff.c.id)
+    .where(DateAccession.id == Tariff.date_accession_id)
+    .values(
+        category_type=bindparam("new_category_type"),
+        rate=bindparam("new_rate"),
+    )
+    .returning(
+        Tariff.id,
+        DateAccession.published_at,
+        _old_tariff.c.category_type.label("old_category_type"),
+        Tariff.category_type,
+        Tariff.rate,
+    )
+    .execution_options(query_name="update_tariff")
+)
+
+DELETE_TARIFF = (
+    delete(Tariff)
+    .where(Tariff.id == bindparam("tariff_id"))
+    .returning(
+        Tariff.id,
+        select(DateAccession.published_at)
+        .where(DateAccession.id == Tariff.date_accession_id)
+        .scalar_subquery()
+        .label("published_at"),
+        Tariff.category_type,
+    )
+    .execution_options(query_name="delete_tariff")
+)
 
 
 class TariffRepo:
     def __init__(self, db: Db):
         self._db = db
 
+    @staticmethod
+    async def _add_events(
+        session: AsyncSession,
+        messages: list[dict[str, Any]],
+    ) -> None:
+        """Событие попадает в outbox в той же транзакции, что и изменение."""
+        if messages:
+            traceparent = tracer.current_traceparent()
+            await session.execute(
+                INSERT_OUTBOX_EVENTS,
+                [
+                    {"payload": message, "traceparent": traceparent}
+                    for message in messages
+                ],
+            )
+
+    @staticmethod
+    async def _notify_rate_changes(
+        session: AsyncSession,
+        changes: list[RateChange],
+    ) -> None:
+        """NOTIFY об изменённых ставках в той же транзакции, только в Postgres."""
+        if changes and session.bind.dialect.name == "postgresql":
+            await session.execute(
+                NOTIFY_RATE_CHANGES,
+                {"payloads": rate_change_payloads(changes)},
+            )
+
+    @staticmethod
+    async def _get_or_create_date_accessions(
+        session: AsyncSession,
+        dates: Iterable[date],
+    ) -> dict[date, UUID]:
+        """id DateAccession по датам; существующие даты переиспользуются."""
+        rows = [{"published_at": published_at} for published_at in dates]
+        if not rows:
+            # INSERT без строк вставил бы дату по умолчанию - текущую
+            return {}
+
+        result = await session.execute(UPSERT_DATE_ACCESSIONS, rows)
+        return dict(result.tuples().all())
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
     async def add_tariffs_with_date_accession(
         self,
         date_accession: date,
         tariffs: list[TariffBase],
     ) -> list[Tariff]:
         async with self._db.get_session() as session:
-            date_accession_model = DateAccession(published_at=date_accession)
-            session.add(date_accession_model)
-            await session.flush()
+            accession_ids = await self._get_or_create_date_accessions(
+                session,
+                [date_accession],
+            )
+            date_accession_id = accession_ids[date_accession]
 
             tariff_models = []
             for tariff in tariffs:
                 rate_model = Tariff(
                     category_type=tariff.category_type,
                     rate=tariff.rate,
-                    date_accession_id=date_accession_model.id,
+                    date_accession_id=date_accession_id,
                 )
                 session.add(rate_model)
                 tariff_models.append(rate_model)
 
+            await self._add_events(
+                session,
+                [
+                    create_message(ActionType.CREATE_TARIFF, str(date_accession_id)),
+                ],
+            )
+            await self._notify_rate_changes(
+                session,
+                [
+                    (date_accession, tariff.category_type, tariff.rate)
+                    for tariff in tariffs
+                ],
+            )
             await session.commit()
             return tariff_models
 
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def add_tariffs_bulk(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> dict[date, UUID]:
+        """
+        Запись всех дат и тарифов одной транзакцией многострочными INSERT
+        без создания ORM-объектов. Возвращает id DateAccession по датам.
+        """
+        if not tariff_data:
+            return {}
+
+        async with self._db.get_session() as session:
+            accession_ids = await self._get_or_create_date_accessions(
+                session,
+                tariff_data,
+            )
+
+            tariff_rows = [
+                {
+                    "category_type": tariff.category_type,
+                    "rate": tariff.rate,
+                    "date_accession_id": accession_ids[published_at],
+                }
+                for published_at, tariffs in tariff_data.items()
+                for tariff in tariffs
+            ]
+            if tariff_rows:
+                await session.execute(INSERT_TARIFFS, tariff_rows)
+
+            await self._add_events(
+                session,
+                [
+                    create_message(ActionType.CREATE_TARIFF, str(accession_id))
+                    for accession_id in accession_ids.values()
+                ],
+            )
+            await self._notify_rate_changes(
+                session,
+                [
+                    (published_at, tariff.category_type, tariff.rate)
+                    for published_at, tariffs in tariff_data.items()
+                    for tariff in tariffs
+                ],
+            )
+            await session.commit()
+            return accession_ids
+
+    @staticmethod
+    def _tariff_keys(
+        accession_ids: dict[date, UUID],
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> dict[tuple[UUID, str], float]:
+        """
+        Ставки по (id DateAccession, категория). Повтор категории в пределах
+        даты: действует последняя ставка, один INSERT ... ON CONFLICT не может
+        изменить строку дважды.
+        """
+        return {
+            (accession_ids[published_at], tariff.category_type): tariff.rate
+            for published_at, tariffs in tariff_data.items()
+            for tariff in tariffs
+        }
+
+    @staticmethod
+    async def _upsert_rows(
+        session: AsyncSession,
+        accession_ids: dict[date, UUID],
+        tariff_rates: dict[tuple[UUID, str], float],
+    ) -> list[TariffUpsertRow]:
+        """Добавленные и изменённые тарифы; строки с той же ставкой не пишутся."""
+        if not tariff_rates:
+            return []
+
+        diff = await session.execute(
+            DIFF_TARIFFS,
+            {
+                "accession_ids": [key[0] for key in tariff_rates],
+                "category_types": [key[1] for key in tariff_rates],
+                "rates": list(tariff_rates.values()),
+            },
+        )
+        changed_rows = [
+            {
+                "date_accession_id": accession_id,
+                "category_type": category_type,
+                "rate": rate,
+            }
+            for accession_id, category_type, rate in diff
+        ]
+        if not changed_rows:
+            return []
+
+        # Сравнение уже отсеяло совпадающие ставки, ON CONFLICT остаётся
+        # на случай параллельной записи тех же категорий
+        published_dates = {
+            accession_id: published_at
+            for published_at, accession_id in accession_ids.items()
+        }
+        result = await session.execute(UPSERT_TARIFFS, changed_rows)
+        return [
+            TariffUpsertRow(
+                published_dates[accession_id], category_type, rate, inserted
+            )
+            for accession_id, category_type, rate, inserted in result
+        ]
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def upsert_tariffs(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> list[TariffUpsertRow]:
+        """
+        Запись тарифов через INSERT ... ON CONFLICT по (дата, категория) одной
+        транзакцией: новые добавляются, у существующих меняется ставка.
+        Возвращает только добавленные и изменённые тарифы, событие outbox
+        создаётся для дат, где что-то изменилось.
+        """
+        if not tariff_data:
+            return []
+
+        async with self._db.get_session() as session:
+            accession_ids = await self._get_or_create_date_accessions(
+                session,
+                tariff_data,
+            )
+            changed = await self._upsert_rows(
+                session,
+                accession_ids,
+                self._tariff_keys(accession_ids, tariff_data),
+            )
+            await self._add_events(
+                session,
+                [
+                    create_message(ActionType.CREATE_TARIFF, str(accession_id))
+                    for accession_id in dict.fromkeys(
+                        accession_ids[row.published_at] for row in changed
+                    )
+                ],
+            )
+            await self._notify_rate_changes(
+                session,
+                [(row.published_at, row.category_type, row.rate) for row in changed],
+            )
+            await session.commit()
+            return changed
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def apply_tariff_delta(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> tuple[list[TariffUpsertRow], list[tuple[date, str]]]:
+        """
+        Приводит тарифы дат файла к файлу одной транзакцией: upsert пишет
+        только новые и изменённые ставки, один DELETE убирает категории,
+        которых в файле нет. Даты вне файла не затрагиваются. Событие outbox
+        создаётся на каждую изменённую категорию. Возвращает изменённые и
+        удалённые (published_at, category_type).
+        """
+        if not tariff_data:
+            return ([], [])
+
+        async with self._db.get_session() as session:
+            accession_ids = await self._get_or_create_date_accessions(
+                session,
+                tariff_data,
+            )
+            tariff_rates = self._tariff_keys(accession_ids, tariff_data)
+            changed = await self._upsert_rows(session, accession_ids, tariff_rates)
+
+            removed = []
+            if accession_ids:
+                published_dates = {
+                    accession_id: published_at
+                    for published_at, accession_id in accession_ids.items()
+                }
+                result = await session.execute(
+                    DELETE_MISSING_TARIFFS,
+                    {
+                        "accession_ids": list(published_dates),
+                        "keep_accession_ids": [key[0] for key in tariff_rates],
+                        "keep_category_types": [key[1] for key in tariff_rates],
+                    },
+                )
+                removed = [
+                    (published_dates[accession_id], category_type)
+                    for accession_id, category_type in result
+                ]
+
+            await self._add_events(
+                session,
+                [
+                    create_tariff_change_message(
+                        (
+                            ActionType.TARIFF_CATEGORY_ADDED
+                            if row.inserted
+                            else ActionType.TARIFF_CATEGORY_UPDATED
+                        ),
+                        row.published_at,
+                        row.category_type,
+                        row.rate,
+                    )
+                    for row in changed
+                ]
+                + [
+                    create_tariff_change_message(
+                        ActionType.TARIFF_CATEGORY_REMOVED,
+                        published_at,
+                        category_type,
+                    )
+                    for published_at, category_type in removed
+                ],
+            )
+            await self._notify_rate_changes(
+                session,
+                [(row.published_at, row.category_type, row.rate) for row in changed]
+                + [
+                    (published_at, category_type, None)
+                    for published_at, category_type in removed
+                ],
+            )
+            await session.commit()
+            return changed, removed
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
     async def get_tariff(
         self,
         effective_date: date,
         category_type: str,
-    ) -> Tariff | None:
-        async with self._db.get_session() as session:
+    ) -> TariffRow | None:
+        async with self._db.read_session() as session:
             result = await session.execute(
-                select(Tariff)
-                .options(
-                    joinedload(Tariff.date_accession),
-                )
-                .join(DateAccession)
-                .where(DateAccession.published_at == effective_date)
-                .where(Tariff.category_type == category_type),
+                GET_TARIFF,
+                {"published_at": effective_date, "category_type": category_type},
             )
-            return result.scalars().first()
+            # (published_at, category_type) уникальна, см. ограничения моделей
+            row = result.one_or_none()
+            return TariffRow(*row) if row is not None else None
 
-    async def get_tariff_by_id(self, tariff_id: UUID) -> Tariff | None:
-        async with self._db.get_session() as session:
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def get_rate(self, effective_date: date, category_type: str) -> float | None:
+        """
+        Только ставка, без построения объектов - путь расчёта стоимости.
+        Результат попадает в RateCache, поэтому чтение с основного сервера.
+        """
+        async with self._db.read_session(primary=True) as session:
+            return await session.scalar(
+                GET_RATE,
+                {"published_at": effective_date, "category_type": category_type},
+            )
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def get_rates(
+        self,
+        keys: Iterable[tuple[date, str]],
+    ) -> dict[tuple[date, str], float]:
+        """
+        Ставки для набора пар (published_at, category_type) одним запросом,
+        с основного сервера: результат попадает в RateCache.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        async with self._db.read_session(primary=True) as session:
+            result = await session.execute(GET_RATES, {"keys": keys})
+            return {
+                (published_at, category_type): rate
+                for published_at, category_type, rate in result
+            }
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def get_rate_as_of(
+        self,
+        effective_date: date,
+        category_type: str,
+    ) -> tuple[date, float] | None:
+        """Последняя ставка категории, опубликованная не позже ``effective_date``."""
+        async with self._db.read_session() as session:
             result = await session.execute(
-                select(Tariff)
-                .options(joinedload(Tariff.date_accession))
-                .where(Tariff.id == tariff_id),
+                GET_RATE_AS_OF,
+                {"published_at": effective_date, "category_type": category_type},
+            )
+            return result.tuples().first()
+
+    async def iter_rates(
+        self,
+        chunk_size: int = 10_000,
+    ) -> AsyncIterator[tuple[date, str, float]]:
+        """
+        Все ставки потоком, без загрузки результата целиком. Снимок для
+        RateIndex читается с основного сервера: уведомления об изменениях
+        (RateSync) приходят оттуда же.
+        """
+        async with self._db.read_session(primary=True) as session:
+            result = await session.stream(
+                ITER_RATES.execution_options(yield_per=chunk_size),
             )
-            return result.scalars().first()
+            async for row in result.tuples():
+                yield row
+
+    @staticmethod
+    def _tariffs_query(
+        date_from: date | None,
+        date_to: date | None,
+        category_type: str | None,
+    ) -> Select[tuple[UUID, date, str, float]]:
+        query = (
+            select(*TARIFF_ROW_COLUMNS)
+            .join(DateAccession)
+            .order_by(DateAccession.published_at, Tariff.id)
+            .execution_options(query_name="list_tariffs")
+        )
+        if date_from is not None:
+            query = query.where(DateAccession.published_at >= date_from)
+        if date_to is not None:
+            query = query.where(DateAccession.published_at <= date_to)
+        if category_type is not None:
+            query = query.where(Tariff.category_type == category_type)
+        return query
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def list_tariffs(
+        self,
+        date_from: date | None,
+        date_to: date | None,
+        category_type: str | None,
+        after: tuple[date, UUID] | None,
+        limit: int,
+    ) -> list[Row[tuple[UUID, date, str, float]]]:
+        """Страница тарифов после ключа ``after`` = (published_at, id)."""
+        query = self._tariffs_query(date_from, date_to, category_type).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(DateAccession.published_at, Tariff.id) > after)
 
-    async def update_tariff(self, tariff: Tariff) -> Tariff:
+        async with self._db.read_session() as session:
+            result = await session.execute(query)
+            return list(result.all())
+
+    async def iter_tariffs(
+        self,
+        date_from: date | None,
+        date_to: date | None,
+        category_type: str | None,
+        chunk_size: int = 5_000,
+    ) -> AsyncIterator[Sequence[Row[tuple[UUID, date, str, float]]]]:
+        """Тарифы пачками по ``chunk_size`` через серверный курсор."""
+        query = self._tariffs_query(date_from, date_to, category_type)
+        async with self._db.read_session() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=chunk_size),
+            )
+            async for rows in result.partitions():
+                yield rows
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def get_tariff_by_id(self, tariff_id: UUID) -> TariffRow | None:
         async with self._db.get_session() as session:
-            session.add(tariff)
-            await session.commit()
-            return tariff
+            result = await session.execute(GET_TARIFF_BY_ID, {"tariff_id": tariff_id})
+            row = result.one_or_none()
+            return TariffRow(*row) if row is not None else None
 
-    async def delete_tariff(self, tariff: Tariff) -> None:
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def update_tariff(
+        self,
+        tariff_id: UUID,
+        tariff: TariffBase,
+    ) -> Row[tuple[UUID, date, str, str, float]] | None:
+        """
+        Изменение тарифа одним UPDATE ... RETURNING в той же транзакции, что
+        и событие outbox. Возвращает дату публикации и прежнюю категорию,
+        None - если тарифа нет.
+        """
         async with self._db.get_session() as session:
-            await session.delete(tariff)
-            await session.commit()
+            result = await session.execute(
+                UPDATE_TARIFF,
+                {
+                    "tariff_id": tariff_id,
+                    "new_category_type": tariff.category_type,
+                    "new_rate": tariff.rate,
+                },
+            )
+            row = result.one_or_none()
+            if row is not None:
+                await self._add_events(
+                    session,
+                    [create_message(ActionType.UPDATE_TARIFF)],
+                )
+                await self._notify_rate_changes(
+                    session,
+                    [
+                        (row.published_at, row.old_category_type, None),
+                        (row.published_at, row.category_type, row.rate),
+                    ],
+                )
+            return row
+
+    @timed(TARIFF_REPO_SECONDS)
+    @traced("tariff_repo")
+    async def delete_tariff(
+        self,
+        tariff_id: UUID,
+    ) -> Row[tuple[UUID, date, str]] | None:
+        """Удаление одним DELETE ... RETURNING, None - если тарифа нет."""
+        async with self._db.get_session() as session:
+            result = await session.execute(DELETE_TARIFF, {"tariff_id": tariff_id})
+            row = result.one_or_none()
+            if row is not None:
+                await self._add_events(
+                    session,
+                    [create_message(ActionType.DELETE_TARIFF)],
+                )
+                await self._notify_rate_changes(
+                    session,
+                    [(row.published_at, row.category_type, None)],
+                )
+            return row
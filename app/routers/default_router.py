@@ -5,12 +5,14 @@ from loguru import logger
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.services.rate_index import RateIndex
 from app.utils.db import Db
 
 
 class DefaultRouter:
-    def __init__(self, db: Db):
+    def __init__(self, db: Db, rate_index: RateIndex):
         self._db = db
+        self._rate_index = rate_index
 
     @property
     def api_router(self) -> APIRouter:
@@ -35,6 +37,8 @@ class DefaultRouter:
                 raise HTTPException(500, "Database not ready")
             logger.debug("pg ready")
 
+            if not self._rate_index.loaded:
+                raise HTTPException(500, "Rate snapshot not loaded")
             return True
 
         @router.get("/exception", include_in_schema=True)
@@ -37,3 +37,29 @@ delete_tariff_description: dict[str, Any] = {
     "example": "da73f1ac-ae75-42e1-a9dd-321ede80e2e6",
     "description": "The uuid of the tariff to delete",
 }
+
+
+import_mode_description: dict[str, Any] = {
+    "description": "default - a transaction per date, "
+    "bulk - all dates in one transaction with multi-row INSERT, "
+    "upsert - insert new tariffs and update changed rates in one transaction, "
+    "returns inserted / updated / unchanged counts; "
+    "a repeated identical import is answered without touching the database; "
+    "delta - each date in the file is its full rate sheet: only added, changed "
+    "and missing categories are written, with an event per changed category",
+}
+
+import_job_description: dict[str, Any] = {
+    "example": "0b7e4b8a-2f4c-4a86-9a51-6a9d3c1c2f10",
+    "description": "The uuid of the import job",
+}
+
+as_of_description: dict[str, Any] = {
+    "description": "Use the latest tariff published on or before published_at "
+    "instead of an exact date match",
+}
+
+export_format_description: dict[str, Any] = {
+    "description": "json - a page with keyset pagination (limit, cursor), "
+    "ndjson / csv - stream every tariff matching the filters",
+}
@@ -1,38 +1,102 @@
 from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Body, File, Path, UploadFile
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Body, File, Path, Query, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
+from app.models.export_format import ExportFormat
+from app.models.import_job import ImportJob
+from app.models.import_mode import ImportMode
 from app.models.tariff import (
     InsuranceCostRequest,
     InsuranceCostResponse,
     TariffBase,
+    TariffDeltaSummary,
+    TariffImportSummary,
+    TariffPage,
     TariffResponse,
+    TariffUpsertSummary,
 )
 from app.routers.example_descriptions import (
     add_tariff_request_example,
+    as_of_description,
     calculate_request_example,
     delete_tariff_description,
+    export_format_description,
+    import_job_description,
+    import_mode_description,
     update_tariff_description,
 )
+from app.services.import_job_service import ImportJobService
 from app.services.tariff_service import TariffService
+from app.utils.tracing import TracedRoute
+
+MAX_CALCULATE_BATCH_SIZE = 10_000
+MAX_PAGE_SIZE = 1_000
+# Ответ загрузки зависит от режима импорта
+TariffImportResult = list[TariffResponse] | TariffUpsertSummary | TariffDeltaSummary
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
 
 
 class TariffRouter:
-    def __init__(self, tariff_service: TariffService):
+    def __init__(
+        self,
+        tariff_service: TariffService,
+        import_job_service: ImportJobService,
+    ):
         self._tariff_service = tariff_service
+        self._import_job_service = import_job_service
 
     @property
     def api_route(self) -> APIRouter:
-        router = APIRouter()
+        router = APIRouter(route_class=TracedRoute)
         self._register(router)
         return router
 
     def _register(self, router: APIRouter) -> None:
+        @router.get(
+            "/",
+            response_model=TariffPage,
+            response_class=ORJSONResponse,
+            status_code=200,
+        )
+        async def list_tariffs(
+            date_from: date | None = Query(None),
+            date_to: date | None = Query(None),
+            category_type: str | None = Query(None, max_length=20),
+            cursor: str | None = Query(None),
+            limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+            export_format: ExportFormat = Query(
+                ExportFormat.JSON,
+                alias="format",
+                **export_format_description,
+            ),
+        ) -> TariffPage | StreamingResponse:
+            if export_format is ExportFormat.JSON:
+                return await self._tariff_service.list_tariffs(
+                    date_from,
+                    date_to,
+                    category_type,
+                    cursor,
+                    limit,
+                )
+
+            return StreamingResponse(
+                self._tariff_service.export_tariffs(
+                    date_from,
+                    date_to,
+                    category_type,
+                    export_format,
+                ),
+                media_type=EXPORT_MEDIA_TYPES[export_format],
+            )
+
         @router.post(
             "/",
-            response_model=list[TariffResponse],
+            response_model=TariffImportResult,
             response_class=ORJSONResponse,
             status_code=201,
         )
@@ -41,17 +105,60 @@ class TariffRouter:
                 ...,
                 example=add_tariff_request_example,
             ),
-        ) -> list[TariffResponse]:
-            return await self._tariff_service.create_tariff(tariff)
+            mode: ImportMode = Query(ImportMode.DEFAULT, **import_mode_description),
+        ) -> TariffImportResult:
+            return await self._tariff_service.create_tariff(tariff, mode)
 
         @router.post(
             "/upload/",
-            response_model=list[TariffResponse],
+            response_model=TariffImportResult,
             response_class=ORJSONResponse,
             status_code=201,
         )
-        async def upload_tariffs(file: UploadFile = File(...)) -> list[TariffResponse]:
-            return await self._tariff_service.upload_tariff(file)
+        async def upload_tariffs(
+            file: UploadFile = File(...),
+            mode: ImportMode = Query(ImportMode.DEFAULT, **import_mode_description),
+        ) -> TariffImportResult:
+            return await self._tariff_service.upload_tariff(file, mode)
+
+        @router.post(
+            "/upload/stream/",
+            response_model=TariffImportSummary,
+            response_class=ORJSONResponse,
+            status_code=201,
+        )
+        async def upload_tariffs_stream(
+            file: UploadFile = File(...),
+        ) -> TariffImportSummary:
+            """
+            Потоковая загрузка: тарифы записываются пачками, каждая пачка
+            фиксируется отдельно. При ошибке в середине файла записанные пачки
+            остаются в БД, а ответ содержит ``{"message": ..., "imported":
+            {"dates": ..., "tariffs": ...}}`` - сколько уже загружено. Повтор
+            того же файла получит 409 на эти даты: догружайте остаток файла
+            или используйте ``/upload/?mode=upsert``.
+            """
+            return await self._tariff_service.upload_tariff_stream(file)
+
+        @router.post(
+            "/jobs/",
+            response_model=ImportJob,
+            response_class=ORJSONResponse,
+            status_code=202,
+        )
+        async def create_import_job(file: UploadFile = File(...)) -> ImportJob:
+            return await self._import_job_service.submit(file)
+
+        @router.get(
+            "/jobs/{job_id}",
+            response_model=ImportJob,
+            response_class=ORJSONResponse,
+            status_code=200,
+        )
+        async def get_import_job(
+            job_id: UUID = Path(..., **import_job_description),
+        ) -> ImportJob:
+            return self._import_job_service.get(job_id)
 
         @router.post(
             "/calculate/",
@@ -64,8 +171,24 @@ class TariffRouter:
                 ...,
                 example=calculate_request_example,
             ),
+            as_of: bool = Query(False, **as_of_description),
         ) -> InsuranceCostResponse:
-            return await self._tariff_service.calculate_insurance_cost(request)
+            return await self._tariff_service.calculate_insurance_cost(request, as_of)
+
+        @router.post(
+            "/calculate/batch/",
+            response_model=list[InsuranceCostResponse],
+            response_class=ORJSONResponse,
+            status_code=200,
+        )
+        async def calculate_cost_batch(
+            requests: list[InsuranceCostRequest] = Body(
+                ...,
+                max_length=MAX_CALCULATE_BATCH_SIZE,
+                example=[calculate_request_example],
+            ),
+        ) -> list[InsuranceCostResponse]:
+            return await self._tariff_service.calculate_insurance_cost_batch(requests)
 
         @router.put(
             "/{tariff_id}/",
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from typing import BinaryIO
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, UploadFile
+from loguru import logger
+
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.models.tariff import TariffImportSummary
+from app.services.tariff_service import TariffService
+from app.settings import ImportJobConfig
+
+
+class ImportJobService:
+    """
+    Фоновый импорт файлов тарифов.
+
+    Файл копируется во временный файл, запрос сразу получает id задачи, а
+    импорт выполняется фоновой задачей. Одновременно работает не больше
+    ``max_concurrent`` импортов, в очереди - не больше ``max_queued``.
+    """
+
+    def __init__(self, tariff_service: TariffService, config: ImportJobConfig):
+        self._tariff_service = tariff_service
+        self._config = config
+        self._semaphore = asyncio.Semaphore(config.max_concurrent)
+        self._jobs: OrderedDict[UUID, ImportJob] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, file: UploadFile) -> ImportJob:
+        if len(self._tasks) >= self._config.max_concurrent + self._config.max_queued:
+            logger.warning("Import job rejected: too many imports in progress.")
+            raise HTTPException(status_code=429, detail="Too many imports in progress")
+
+        path = await asyncio.to_thread(self._spool, file.file)
+        job = ImportJob(id=uuid4(), filename=file.filename, created_at=datetime.now())
+        self._jobs[job.id] = job
+        self._forget_finished()
+
+        task = asyncio.create_task(self._run(job, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(f"Import job {job.id} for file {file.filename} queued.")
+        return job
+
+    def get(self, job_id: UUID) -> ImportJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Import job not found")
+        return job
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    def _spool(source: BinaryIO) -> str:
+        source.seek(0)
+        with tempfile.NamedTemporaryFile(prefix="tariffs_", delete=False) as target:
+            shutil.copyfileobj(source, target)
+            return target.name
+
+    async def _run(self, job: ImportJob, path: str) -> None:
+        def on_progress(summary: TariffImportSummary, bytes_read: int) -> None:
+            job.dates_processed = summary.dates
+            job.tariffs_processed = summary.tariffs
+            job.bytes_processed = bytes_read
+
+        try:
+            async with self._semaphore:
+                job.status = ImportJobStatus.RUNNING
+                job.started_at = datetime.now()
+                with open(path, "rb") as source:
+                    await self._tariff_service.upload_tariff_stream(
+                        UploadFile(source, filename=job.filename),
+                        on_progress=on_progress,
+                    )
+            job.status = ImportJobStatus.COMPLETED
+            logger.info(
+                f"Import job {job.id} completed: {job.tariffs_processed} tariffs.",
+            )
+        except asyncio.CancelledError:
+            job.status = ImportJobStatus.FAILED
+            job.errors.append("Import cancelled")
+            raise
+        except HTTPException as e:
+            # Записанное до ошибки уже в dates_processed / tariffs_processed
+            detail: object = e.detail
+            message = detail["message"] if isinstance(detail, dict) else detail
+            job.status = ImportJobStatus.FAILED
+            job.errors.append(str(message))
+            logger.warning(f"Import job {job.id} failed: {message}")
+        except Exception as e:
+            job.status = ImportJobStatus.FAILED
+            job.errors.append("Internal error")
+            logger.exception(f"Import job {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            os.remove(path)
+
+    def _forget_finished(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.finished_at is not None
+        ]
+        for job_id in finished[: max(len(finished) - self._config.max_finished, 0)]:
+            del self._jobs[job_id]
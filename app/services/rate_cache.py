@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import date
+
+from app.utils.metrics import RATE_CACHE_EVICTIONS, RATE_CACHE_HITS, RATE_CACHE_MISSES
+
+RateKey = tuple[date, str]
+
+
+class RateCache:
+    """
+    LRU-кэш ставок по ключу (published_at, category_type) с ограничением по TTL.
+
+    Каждая инвалидация увеличивает ``generation``: значение, прочитанное из БД
+    до инвалидации, не попадёт в кэш (см. ``put``).
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 60.0) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[RateKey, tuple[float, float]] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: RateKey) -> float | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            RATE_CACHE_MISSES.inc()
+            return None
+
+        rate, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            RATE_CACHE_EVICTIONS.labels(reason="ttl").inc()
+            RATE_CACHE_MISSES.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        RATE_CACHE_HITS.inc()
+        return rate
+
+    def put(self, key: RateKey, rate: float, generation: int | None = None) -> None:
+        if self._max_size <= 0:
+            return
+        if generation is not None and generation != self._generation:
+            # Пока читали из БД, тариф успели изменить
+            return
+
+        self._entries[key] = (rate, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            RATE_CACHE_EVICTIONS.labels(reason="size").inc()
+
+    def invalidate(self, keys: Iterable[RateKey]) -> None:
+        self._generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                RATE_CACHE_EVICTIONS.labels(reason="invalidate").inc()
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
@@ -0,0 +1,75 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import AsyncIterable
+from datetime import date
+
+
+class RateIndex:
+    """
+    Ставки в памяти для поиска тарифа, действующего на дату.
+
+    Для каждой категории хранятся два параллельных массива, отсортированных по
+    дате публикации: порядковые номера дат и ставки. Поиск - ``bisect``.
+    """
+
+    def __init__(self) -> None:
+        self._dates: dict[str, array] = {}
+        self._rates: dict[str, array] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return sum(len(dates) for dates in self._dates.values())
+
+    async def load(self, rows: AsyncIterable[tuple[date, str, float]]) -> None:
+        """Строки удобнее отдавать отсортированными по категории и дате."""
+        dates: dict[str, array] = {}
+        rates: dict[str, array] = {}
+        async for published_at, category_type, rate in rows:
+            if category_type not in dates:
+                dates[category_type] = array("l")
+                rates[category_type] = array("d")
+            dates[category_type].append(published_at.toordinal())
+            rates[category_type].append(rate)
+
+        for category_type, category_dates in dates.items():
+            if any(a > b for a, b in zip(category_dates, category_dates[1:])):
+                items = sorted(zip(category_dates, rates[category_type]))
+                dates[category_type] = array("l", (day for day, _ in items))
+                rates[category_type] = array("d", (rate for _, rate in items))
+
+        self._dates, self._rates = dates, rates
+        self.loaded = True
+
+    def upsert(self, published_at: date, category_type: str, rate: float) -> None:
+        dates = self._dates.setdefault(category_type, array("l"))
+        rates = self._rates.setdefault(category_type, array("d"))
+        day = published_at.toordinal()
+
+        position = bisect_left(dates, day)
+        if position < len(dates) and dates[position] == day:
+            rates[position] = rate
+        else:
+            dates.insert(position, day)
+            rates.insert(position, rate)
+
+    def remove(self, published_at: date, category_type: str) -> None:
+        dates = self._dates.get(category_type)
+        if dates is None:
+            return
+
+        day = published_at.toordinal()
+        position = bisect_left(dates, day)
+        if position < len(dates) and dates[position] == day:
+            del dates[position]
+            del self._rates[category_type][position]
+
+    def as_of(self, category_type: str, day: date) -> tuple[date, float] | None:
+        """Последняя ставка, опубликованная не позже ``day``."""
+        dates = self._dates.get(category_type)
+        if not dates:
+            return None
+
+        position = bisect_right(dates, day.toordinal()) - 1
+        if position < 0:
+            return None
+        return date.fromordinal(dates[position]), self._rates[category_type][position]
@@ -0,0 +1,102 @@
+import asyncio
+
+from loguru import logger
+
+from app.repositories.tariff_repository import (
+    parse_rate_changes,
+    PROCESS_ORIGIN,
+    RATE_CHANGES_CHANNEL,
+    RateChange,
+)
+from app.services.tariff_service import TariffService
+from app.settings import RateSyncConfig
+from app.utils.db import Db
+from app.utils.metrics import RATE_SYNC_NOTIFICATIONS
+
+
+class RateSync:
+    """
+    Фоновая загрузка снимка ставок (``RateIndex``) и применение изменений
+    других реплик: записи ``TariffRepo`` шлют NOTIFY, здесь - LISTEN.
+
+    LISTEN начинается до загрузки снимка, уведомления за время загрузки
+    копятся и применяются после неё, поэтому изменения между чтением снимка
+    и подпиской не теряются. После обрыва соединения снимок загружается
+    заново: уведомления, пришедшие без слушателя, потеряны.
+
+    Свои уведомления процесс пропускает: эти изменения сервис уже применил,
+    а повторное применение очистило бы реестр недавних upsert-загрузок.
+    Во время загрузки снимка они копятся вместе с чужими, чтобы запись,
+    сделанная после чтения снимка, не пропала при его замене.
+    """
+
+    def __init__(
+        self,
+        db: Db,
+        tariff_service: TariffService,
+        config: RateSyncConfig,
+    ):
+        self._db = db
+        self._tariff_service = tariff_service
+        self._config = config
+        self._task: asyncio.Task | None = None
+        # Уведомления, пришедшие во время загрузки снимка: (свои ли, изменения)
+        self._pending: list[tuple[bool, list[RateChange]]] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not (self._config.listen and self._db.supports_listen):
+                    await self._tariff_service.load_rate_index()
+                    return
+                await self._listen()
+            except Exception as e:
+                logger.exception(f"Rate sync failed: {e}")
+            await asyncio.sleep(self._config.reconnect_interval)
+
+    async def _listen(self) -> None:
+        closed = asyncio.Event()
+        self._pending = []
+        try:
+            async with self._db.listen(
+                RATE_CHANGES_CHANNEL,
+                self._on_notify,
+                closed.set,
+            ):
+                await self._tariff_service.load_rate_index()
+                pending, self._pending = self._pending, None
+                for own, changes in pending:
+                    self._tariff_service.apply_rate_changes(
+                        changes,
+                        from_other_replica=not own,
+                    )
+                logger.info(f"Listening for rate changes on {RATE_CHANGES_CHANNEL}.")
+                await closed.wait()
+        finally:
+            self._pending = None
+        logger.warning("Rate changes listener connection lost.")
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            origin, changes = parse_rate_changes(payload)
+        except (ValueError, TypeError, KeyError) as e:
+            RATE_SYNC_NOTIFICATIONS.labels(result="invalid").inc()
+            logger.warning(f"Invalid rate changes notification: {e}")
+            return
+
+        own = origin == PROCESS_ORIGIN
+        RATE_SYNC_NOTIFICATIONS.labels(result="own" if own else "received").inc()
+        if self._pending is not None:
+            self._pending.append((own, changes))
+        elif not own:
+            self._tariff_service.apply_rate_changes(changes)
@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict
+
+from app.models.tariff import TariffUpsertSummary
+
+
+class RecentImports:
+    """
+    Итоги недавних upsert-загрузок по хэшу содержимого: повтор того же файла
+    (ретрай партнёра) отвечает сразу, без разбора и запросов к БД.
+
+    Любое другое изменение тарифов очищает реестр (``clear``): после него БД
+    может уже не совпадать с файлом. Реестр свой у каждого процесса, повтор,
+    попавший в другой процесс, просто выполнит upsert без изменений.
+    """
+
+    def __init__(self, max_size: int = 1_000, ttl: float = 3600.0) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[TariffUpsertSummary, float]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, content_hash: str) -> TariffUpsertSummary | None:
+        entry = self._entries.get(content_hash)
+        if entry is None:
+            return None
+
+        summary, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[content_hash]
+            return None
+
+        self._entries.move_to_end(content_hash)
+        return summary
+
+    def put(self, summary: TariffUpsertSummary) -> None:
+        if self._max_size <= 0:
+            return
+
+        self._entries[summary.content_hash] = (summary, time.monotonic() + self._ttl)
+        self._entries.move_to_end(summary.content_hash)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
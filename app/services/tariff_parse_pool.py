@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.models.tariff import TariffBase
+from app.settings import TariffImportConfig
+
+# Файл загрузки: {"2020-06-01": [{"category_type": ..., "rate": ...}, ...]}
+TARIFF_FILE_ADAPTER = TypeAdapter(dict[date, list[TariffBase]])
+
+# Начало ключа верхнего уровня: '{' или ',' перед "дата": [
+_DATE_KEY = re.compile(rb'[{,]\s*"\d{4}-\d{2}-\d{2}"\s*:\s*\[')
+
+
+def split_by_date(contents: bytes, shards: int) -> list[bytes]:
+    """
+    Делит файл на ``shards`` JSON-объектов примерно равного размера по границам
+    ключей-дат, не разбирая JSON: ключ ищется только после каждой границы.
+    Граница, найденная внутри вложенного значения, даёт невалидный JSON в
+    части - см. ``TariffParsePool.parse``.
+    """
+    first = _DATE_KEY.search(contents)
+    if shards < 2 or first is None:
+        return [contents]
+
+    bounds = [first.start()]
+    step = len(contents) // shards
+    for number in range(1, shards):
+        match = _DATE_KEY.search(contents, max(step * number, bounds[-1] + 1))
+        if match is None:
+            break
+        if match.start() > bounds[-1]:
+            bounds.append(match.start())
+
+    parts = [
+        b"{" + contents[start + 1 : end] + b"}"
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    parts.append(b"{" + contents[bounds[-1] + 1 :])
+    return parts
+
+
+def parse_shard(contents: bytes) -> dict[date, list[TariffBase]]:
+    return TARIFF_FILE_ADAPTER.validate_json(contents)
+
+
+def _is_invalid_json(error: ValidationError) -> bool:
+    return any(item["type"] == "json_invalid" for item in error.errors())
+
+
+class TariffParsePool:
+    """
+    Разбор больших файлов загрузки в пуле процессов, чтобы валидация не
+    занимала event loop. Файл делится по датам на части около
+    ``parse_shard_bytes``: модели возвращаются из процессов через pickle, и
+    распаковка одной большой части надолго заняла бы GIL. Результаты
+    объединяются в порядке частей. Пул создаётся при первом обращении.
+    """
+
+    def __init__(self, config: TariffImportConfig) -> None:
+        self._config = config
+        self._executor: ProcessPoolExecutor | None = None
+
+    def should_offload(self, size: int) -> bool:
+        return (
+            self._config.parse_processes > 0
+            and size >= self._config.parse_offload_bytes
+        )
+
+    async def parse(self, contents: bytes) -> dict[date, list[TariffBase]]:
+        """Ошибки валидации поднимаются как ``ValidationError`` исходного файла."""
+        shards = split_by_date(
+            contents,
+            max(
+                self._config.parse_processes,
+                -(-len(contents) // self._config.parse_shard_bytes),
+            ),
+        )
+        try:
+            results = await asyncio.gather(
+                *(self._run(shard) for shard in shards),
+            )
+        except ValidationError as e:
+            if len(shards) == 1 or not _is_invalid_json(e):
+                raise
+            # Файл битый или граница попала внутрь значения: разбираем целиком,
+            # чтобы получить результат и ошибку как без деления
+            results = [await self._run(contents)]
+
+        tariffs: dict[date, list[TariffBase]] = {}
+        for result in results:
+            tariffs.update(result)
+        return tariffs
+
+    async def _run(self, contents: bytes) -> dict[date, list[TariffBase]]:
+        if self._executor is None:
+            # spawn: fork процесса с потоками (логгер, драйверы БД) небезопасен
+            self._executor = ProcessPoolExecutor(
+                self._config.parse_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, parse_shard, contents)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,69 +1,165 @@
-import json
-from datetime import date, datetime
-from typing import Any
+import csv
+import hashlib
+import io
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import date
 from uuid import UUID
 
+import orjson
 from fastapi import HTTPException, UploadFile
 from loguru import logger
-from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.kafka.messages import create_message
 from app.kafka.producer import KafkaProducer
 from app.models.action_type import ActionType
+from app.models.export_format import ExportFormat
+from app.models.import_mode import ImportMode
 from app.models.tariff import (
     InsuranceCostRequest,
     InsuranceCostResponse,
     TariffBase,
+    TariffDeltaSummary,
+    TariffImportSummary,
+    TariffPage,
+    TariffRecord,
     TariffResponse,
+    TariffUpsertSummary,
 )
-from app.orm_models import Tariff
-from app.repositories.tariff_repository import TariffRepo
+from app.repositories.tariff_repository import RateChange, TariffRepo, TariffRow
+from app.services.rate_cache import RateCache
+from app.services.rate_index import RateIndex
+from app.services.recent_imports import RecentImports
+from app.services.tariff_parse_pool import TARIFF_FILE_ADAPTER, TariffParsePool
+from app.services.tariff_stream_parser import TariffStreamParser
+from app.settings import LoggingConfig, TariffImportConfig
+from app.utils.logger_config import LogRateLimit
+from app.utils.metrics import (
+    TARIFF_CALCULATE_BATCH_SIZE,
+    TARIFF_DELTA_ROWS,
+    TARIFF_DUPLICATE_IMPORTS,
+    TARIFF_ROWS_INGESTED,
+    TARIFF_SERVICE_SECONDS,
+    TARIFF_UPLOAD_BYTES,
+    TARIFF_UPSERT_ROWS,
+    TARIFF_WRITE_BATCH_ROWS,
+    timed,
+)
+from app.utils.tracing import traced
+
+DUPLICATE_TARIFF_DETAIL = "Tariff for this date and category type already exists"
+EXPORT_CSV_HEADER = b"id,published_at,category_type,rate\r\n"
 
 
 class TariffFileProcessor:
     @staticmethod
     def process_file(contents: bytes) -> dict[date, list[TariffBase]]:
+        """
+        Разбор JSON и валидация всего файла за один вызов pydantic-core, без
+        промежуточных словарей и построения моделей в цикле на Python.
+        """
         try:
-            data = json.loads(contents)
-            tariffs = {}
-            for date_str, tariff_list in data.items():
-                published_at = date.fromisoformat(date_str)
-                tariff_objects = [TariffBase(**tariff) for tariff in tariff_list]
-                tariffs[published_at] = tariff_objects
-                logger.info(
-                    f"Processed rates for date {published_at}: {tariff_objects}",
-                )
-            return tariffs
-        except json.JSONDecodeError:
-            logger.exception("Invalid JSON format.")
-            raise HTTPException(status_code=400, detail="Invalid JSON format")
+            tariffs = TARIFF_FILE_ADAPTER.validate_json(contents)
         except Exception as e:
+            raise TariffFileProcessor._parse_error(e)
+        return TariffFileProcessor._processed(tariffs)
+
+    @staticmethod
+    async def process_file_in_pool(
+        contents: bytes,
+        pool: TariffParsePool,
+    ) -> dict[date, list[TariffBase]]:
+        """То же, что ``process_file``, но разбор идёт в пуле процессов."""
+        try:
+            tariffs = await pool.parse(contents)
+        except Exception as e:
+            raise TariffFileProcessor._parse_error(e)
+        return TariffFileProcessor._processed(tariffs)
+
+    @staticmethod
+    def _processed(
+        tariffs: dict[date, list[TariffBase]],
+    ) -> dict[date, list[TariffBase]]:
+        logger.debug(
+            "Processed {} rates for {} dates.",
+            sum(len(tariff_list) for tariff_list in tariffs.values()),
+            len(tariffs),
+        )
+        return tariffs
+
+    @staticmethod
+    def _parse_error(e: Exception) -> HTTPException:
+        if not isinstance(e, ValidationError):
             logger.exception(f"An error occurred while processing the file: {e}")
-            raise HTTPException(
+            return HTTPException(
                 status_code=500,
                 detail="An error occurred while processing the file",
             )
 
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            logger.warning("Invalid JSON format.")
+            return HTTPException(status_code=400, detail="Invalid JSON format")
+
+        error = e.errors(include_url=False)[0]
+        location = ".".join(str(part) for part in error["loc"]) or "<root>"
+        logger.warning(f"Invalid tariff file: {e.error_count()} errors.")
+        return HTTPException(
+            status_code=400,
+            detail=f"Invalid tariff file: {location}: {error['msg']}",
+        )
+
 
 class TariffService:
-    def __init__(self, tariff_repo: TariffRepo, kafka_producer: KafkaProducer):
+    def __init__(
+        self,
+        tariff_repo: TariffRepo,
+        kafka_producer: KafkaProducer,
+        rate_cache: RateCache,
+        rate_index: RateIndex,
+        import_config: TariffImportConfig,
+        logging_config: LoggingConfig,
+        parse_pool: TariffParsePool,
+        recent_imports: RecentImports,
+    ):
         self._tariff_repo = tariff_repo
         self._kafka_producer = kafka_producer
+        self._rate_cache = rate_cache
+        self._rate_index = rate_index
+        self._import_config = import_config
+        self._parse_pool = parse_pool
+        self._recent_imports = recent_imports
+        # Лимиты info-логов на пути расчёта, по одному на место вызова
+        self._calculate_log_limit = LogRateLimit(
+            logging_config.pricing_logs_per_second,
+        )
+        self._calculate_batch_log_limit = LogRateLimit(
+            logging_config.pricing_logs_per_second,
+        )
 
-    @staticmethod
-    def _create_message(
-        action: ActionType,
-        user_id: str | None = None,
-    ) -> dict[str, Any]:
-        return {
-            "user_id": user_id,
-            "action": action.value,
-            "timestamp": str(datetime.now()),
-        }
-
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
     async def create_tariff(
         self,
         tariff_data: dict[date, list[TariffBase]],
-    ) -> list[TariffResponse]:
+        mode: ImportMode = ImportMode.DEFAULT,
+        content_hash: str | None = None,
+    ) -> list[TariffResponse] | TariffUpsertSummary | TariffDeltaSummary:
+        """
+        ``content_hash`` - хэш исходного файла для режима upsert; без него
+        хэшируется ``tariff_data``.
+        """
+        if mode is ImportMode.UPSERT:
+            return await self._upsert_tariffs(tariff_data, content_hash)
+        if mode is ImportMode.DELTA:
+            return await self._apply_tariff_delta(tariff_data)
+
+        if mode is ImportMode.BULK:
+            response_tariffs = await self._create_tariff_bulk(tariff_data)
+            self._count_ingested(mode.value, self._count_rows(tariff_data))
+            return response_tariffs
+
         response_tariffs = []
         for published_at, tariff_list in tariff_data.items():
             try:
@@ -71,6 +167,8 @@ class TariffService:
                     published_at,
                     tariff_list,
                 )
+                self._tariffs_changed(published_at, tariff_list)
+                self._count_ingested(mode.value, len(tariff_list))
                 example_user_id = tariff_models[0].date_accession_id
 
                 response_tariffs.append(
@@ -84,12 +182,9 @@ class TariffService:
                     f"Successfully created tariffs for published_at {published_at}.",
                 )
 
-                message = self._create_message(
-                    ActionType.CREATE_TARIFF,
-                    str(example_user_id),
-                )
-                await self._kafka_producer.send_message(message)
-
+            except IntegrityError:
+                logger.warning(f"Duplicate tariff category for {published_at}.")
+                raise HTTPException(status_code=409, detail=DUPLICATE_TARIFF_DETAIL)
             except SQLAlchemyError as e:
                 logger.exception(f"Database error occurred while adding tariff: {e}")
                 raise HTTPException(status_code=500, detail="Database error occurred")
@@ -100,95 +195,604 @@ class TariffService:
         logger.info(f"Created {len(response_tariffs)} tariffs successfully.")
         return response_tariffs
 
-    async def upload_tariff(self, file: UploadFile) -> list[TariffResponse]:
+    async def _create_tariff_bulk(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> list[TariffResponse]:
+        if not tariff_data:
+            return []
+
+        try:
+            accession_ids = await self._tariff_repo.add_tariffs_bulk(tariff_data)
+        except IntegrityError:
+            logger.warning("Duplicate tariff category in bulk import.")
+            raise HTTPException(status_code=409, detail=DUPLICATE_TARIFF_DETAIL)
+        except SQLAlchemyError as e:
+            logger.exception(f"Database error occurred while adding tariffs: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+        except ValueError as value_error:
+            logger.exception("Invalid data provided for tariff creation.")
+            raise HTTPException(status_code=400, detail=str(value_error))
+
+        for published_at, tariff_list in tariff_data.items():
+            self._tariffs_changed(published_at, tariff_list)
+
+        response_tariffs = []
+        for published_at, tariff_list in tariff_data.items():
+            response_tariffs.append(
+                TariffResponse(
+                    id=accession_ids[published_at],
+                    published_at=published_at,
+                    tariffs=tariff_list,
+                ),
+            )
+
+        logger.info(f"Created {len(response_tariffs)} tariffs in bulk successfully.")
+        return response_tariffs
+
+    async def _upsert_tariffs(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+        content_hash: str | None,
+    ) -> TariffUpsertSummary:
+        if content_hash is None:
+            content_hash = self._content_hash(tariff_data)
+        if not tariff_data:
+            return TariffUpsertSummary(
+                content_hash=content_hash,
+                inserted=0,
+                updated=0,
+                unchanged=0,
+            )
+        if duplicate := self._duplicate_import(content_hash):
+            return duplicate
+
+        try:
+            changed = await self._tariff_repo.upsert_tariffs(tariff_data)
+        except IntegrityError:
+            logger.warning("Integrity error in upsert import.")
+            raise HTTPException(status_code=409, detail=DUPLICATE_TARIFF_DETAIL)
+        except SQLAlchemyError as e:
+            logger.exception(f"Database error occurred while upserting tariffs: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        self._recent_imports.clear()
+        self._rate_cache.invalidate(
+            (row.published_at, row.category_type) for row in changed
+        )
+        for row in changed:
+            self._rate_index.upsert(row.published_at, row.category_type, row.rate)
+
+        total = self._count_categories(tariff_data)
+        inserted = sum(row.inserted for row in changed)
+        summary = TariffUpsertSummary(
+            content_hash=content_hash,
+            inserted=inserted,
+            updated=len(changed) - inserted,
+            unchanged=total - len(changed),
+        )
+        self._recent_imports.put(summary)
+
+        TARIFF_UPSERT_ROWS.labels(result="inserted").inc(summary.inserted)
+        TARIFF_UPSERT_ROWS.labels(result="updated").inc(summary.updated)
+        TARIFF_UPSERT_ROWS.labels(result="unchanged").inc(summary.unchanged)
+        self._count_ingested(ImportMode.UPSERT.value, len(changed))
+        logger.info(
+            f"Upserted tariffs: {summary.inserted} inserted, "
+            f"{summary.updated} updated, {summary.unchanged} unchanged.",
+        )
+        return summary
+
+    async def _apply_tariff_delta(
+        self,
+        tariff_data: dict[date, list[TariffBase]],
+    ) -> TariffDeltaSummary:
+        if not tariff_data:
+            return TariffDeltaSummary(inserted=0, updated=0, removed=0, unchanged=0)
+
+        try:
+            changed, removed = await self._tariff_repo.apply_tariff_delta(
+                tariff_data,
+            )
+        except IntegrityError:
+            logger.warning("Integrity error in delta import.")
+            raise HTTPException(status_code=409, detail=DUPLICATE_TARIFF_DETAIL)
+        except SQLAlchemyError as e:
+            logger.exception(f"Database error occurred while applying delta: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        self._recent_imports.clear()
+        self._rate_cache.invalidate(
+            [(row.published_at, row.category_type) for row in changed] + removed,
+        )
+        for row in changed:
+            self._rate_index.upsert(row.published_at, row.category_type, row.rate)
+        for key in removed:
+            self._rate_index.remove(*key)
+
+        inserted = sum(row.inserted for row in changed)
+        summary = TariffDeltaSummary(
+            inserted=inserted,
+            updated=len(changed) - inserted,
+            removed=len(removed),
+            unchanged=self._count_categories(tariff_data) - len(changed),
+        )
+        TARIFF_DELTA_ROWS.labels(result="inserted").inc(summary.inserted)
+        TARIFF_DELTA_ROWS.labels(result="updated").inc(summary.updated)
+        TARIFF_DELTA_ROWS.labels(result="removed").inc(summary.removed)
+        TARIFF_DELTA_ROWS.labels(result="unchanged").inc(summary.unchanged)
+        self._count_ingested(ImportMode.DELTA.value, len(changed) + len(removed))
+        logger.info(
+            f"Applied tariff delta: {summary.inserted} inserted, "
+            f"{summary.updated} updated, {summary.removed} removed, "
+            f"{summary.unchanged} unchanged.",
+        )
+        return summary
+
+    @staticmethod
+    def _count_categories(tariff_data: dict[date, list[TariffBase]]) -> int:
+        """Число различных (дата, категория): повтор категории - одна запись."""
+        return len(
+            {
+                (published_at, tariff.category_type)
+                for published_at, tariff_list in tariff_data.items()
+                for tariff in tariff_list
+            },
+        )
+
+    def _duplicate_import(self, content_hash: str) -> TariffUpsertSummary | None:
+        """Итог для повтора уже применённой загрузки, None - если её не было."""
+        applied = self._recent_imports.get(content_hash)
+        if applied is None:
+            return None
+
+        TARIFF_DUPLICATE_IMPORTS.inc()
+        logger.info(f"Tariff import {content_hash} was already applied, skipping.")
+        return TariffUpsertSummary(
+            content_hash=content_hash,
+            inserted=0,
+            updated=0,
+            unchanged=applied.inserted + applied.updated + applied.unchanged,
+            duplicate=True,
+        )
+
+    @staticmethod
+    def _content_hash(tariff_data: dict[date, list[TariffBase]]) -> str:
+        canonical = orjson.dumps(
+            {
+                published_at.isoformat(): [
+                    tariff.model_dump() for tariff in tariff_list
+                ]
+                for published_at, tariff_list in tariff_data.items()
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(canonical).hexdigest()
+
+    def _tariffs_changed(
+        self,
+        published_at: date,
+        tariff_list: list[TariffBase],
+    ) -> None:
+        self._recent_imports.clear()
+        self._rate_cache.invalidate(
+            (published_at, tariff.category_type) for tariff in tariff_list
+        )
+        for tariff in tariff_list:
+            self._rate_index.upsert(published_at, tariff.category_type, tariff.rate)
+
+    @staticmethod
+    def _count_rows(tariff_data: dict[date, list[TariffBase]]) -> int:
+        return sum(len(tariff_list) for tariff_list in tariff_data.values())
+
+    @staticmethod
+    def _count_ingested(mode: str, rows: int) -> None:
+        """``rows`` - записанные строки: в upsert и delta без неизменённых."""
+        TARIFF_ROWS_INGESTED.labels(mode=mode).inc(rows)
+        TARIFF_WRITE_BATCH_ROWS.labels(mode=mode).observe(rows)
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def load_rate_index(self) -> None:
+        await self._rate_index.load(self._tariff_repo.iter_rates())
+        logger.info(f"Rate index loaded: {len(self._rate_index)} rates.")
+
+    def apply_rate_changes(
+        self,
+        changes: list[RateChange],
+        from_other_replica: bool = True,
+    ) -> None:
+        """
+        Изменения ставок из уведомлений ``RateSync``. Свои изменения реестр
+        недавних загрузок не сбрасывают: он уже учитывает их.
+        """
+        if from_other_replica:
+            self._recent_imports.clear()
+        self._rate_cache.invalidate(
+            (published_at, category_type) for published_at, category_type, _ in changes
+        )
+        for published_at, category_type, rate in changes:
+            if rate is None:
+                self._rate_index.remove(published_at, category_type)
+            else:
+                self._rate_index.upsert(published_at, category_type, rate)
+
+    def shutdown(self) -> None:
+        self._parse_pool.shutdown()
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def upload_tariff(
+        self,
+        file: UploadFile,
+        mode: ImportMode = ImportMode.DEFAULT,
+    ) -> list[TariffResponse] | TariffUpsertSummary | TariffDeltaSummary:
         contents = await file.read()
-        tariffs_data = TariffFileProcessor.process_file(contents)
+        TARIFF_UPLOAD_BYTES.labels(mode=mode.value).inc(len(contents))
+        content_hash = None
+        if mode is ImportMode.UPSERT:
+            # Повтор того же файла отвечает до разбора
+            content_hash = hashlib.sha256(contents).hexdigest()
+            if duplicate := self._duplicate_import(content_hash):
+                return duplicate
+
+        with TARIFF_SERVICE_SECONDS.labels(operation="parse_file").time():
+            if self._parse_pool.should_offload(len(contents)):
+                tariffs_data = await TariffFileProcessor.process_file_in_pool(
+                    contents,
+                    self._parse_pool,
+                )
+            else:
+                tariffs_data = TariffFileProcessor.process_file(contents)
         logger.info(f"Tariff file {file.filename} uploaded and processed.")
-        return await self.create_tariff(tariffs_data)
+        return await self.create_tariff(tariffs_data, mode, content_hash)
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def upload_tariff_stream(
+        self,
+        file: UploadFile,
+        on_progress: Callable[[TariffImportSummary, int], None] | None = None,
+    ) -> TariffImportSummary:
+        """
+        Потоковая загрузка файла: тарифы пишутся пачками по ``batch_rows`` строк,
+        не дожидаясь разбора всего файла. После каждой записанной пачки
+        вызывается ``on_progress(summary, bytes_read)``.
+        """
+        parser = TariffStreamParser(file, chunk_size=self._import_config.chunk_size)
+        summary = TariffImportSummary(dates=0, tariffs=0)
+        batch: dict[date, list[TariffBase]] = {}
+
+        async def flush() -> None:
+            await self._create_tariff_bulk(batch)
+            rows = self._count_rows(batch)
+            self._count_ingested("stream", rows)
+            summary.dates += len(batch)
+            summary.tariffs += rows
+            batch.clear()
+            if on_progress is not None:
+                on_progress(summary, parser.bytes_read)
+
+        batch_rows = 0
+        try:
+            async for published_at, tariff_list in parser.groups():
+                if published_at in batch:
+                    await flush()
+                    batch_rows = 0
+
+                batch[published_at] = tariff_list
+                batch_rows += len(tariff_list)
+
+                if batch_rows >= self._import_config.batch_rows:
+                    await flush()
+                    batch_rows = 0
+
+            if batch:
+                await flush()
+        except ValueError as e:
+            logger.warning(
+                f"Invalid tariff file {file.filename}: {e}, "
+                f"{summary.tariffs} tariffs already imported.",
+            )
+            raise self._stream_import_error(400, f"Invalid tariff file: {e}", summary)
+        except HTTPException as e:
+            raise self._stream_import_error(e.status_code, e.detail, summary)
 
+        TARIFF_UPLOAD_BYTES.labels(mode="stream").inc(parser.bytes_read)
+        logger.info(
+            f"Tariff file {file.filename} imported: {summary.dates} dates, "
+            f"{summary.tariffs} tariffs, {parser.bytes_read} bytes.",
+        )
+        return summary
+
+    @staticmethod
+    def _stream_import_error(
+        status_code: int,
+        message: str,
+        summary: TariffImportSummary,
+    ) -> HTTPException:
+        """
+        Пачки до ошибки уже записаны: в ответе, сколько дат и тарифов
+        осталось в БД.
+        """
+        return HTTPException(
+            status_code=status_code,
+            detail={"message": message, "imported": summary.model_dump()},
+        )
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
     async def calculate_insurance_cost(
         self,
         request: InsuranceCostRequest,
+        as_of: bool = False,
     ) -> InsuranceCostResponse:
-        result = await self._tariff_repo.get_tariff(
-            request.published_at,
-            request.category_type,
-        )
+        if as_of:
+            found = await self._get_rate_as_of(
+                request.published_at,
+                request.category_type,
+            )
+            rate_published_at, rate = found or (None, None)
+        else:
+            rate_published_at = request.published_at
+            rate = await self._get_rate(request.published_at, request.category_type)
 
-        if result is None:
+        if rate is None:
             logger.warning(
-                f"Rate not found for the given date {request.published_at} and category type: {request.category_type}.",  # noqa: E501
+                "Rate not found for the given date {} and category type: {}.",
+                request.published_at,
+                request.category_type,
             )
             raise HTTPException(
                 status_code=404,
                 detail="Rate not found for the given date and category type",
             )
 
-        insurance_cost = request.declared_value * result.rate
-        logger.info(
-            f"Insurance cost calculated: {insurance_cost} for declared value: {request.declared_value} and rate: {result.rate}.",  # noqa: E501
-        )
+        insurance_cost = request.declared_value * rate
+        if (skipped := self._calculate_log_limit.acquire()) is not None:
+            logger.info(
+                "Insurance cost calculated: {} for declared value: {} and rate: {} "
+                "({} similar records skipped).",
+                insurance_cost,
+                request.declared_value,
+                rate,
+                skipped,
+            )
 
-        message = self._create_message(ActionType.CALCULATE_INSURANCE_COST)
+        message = create_message(ActionType.CALCULATE_INSURANCE_COST)
         await self._kafka_producer.send_message(message)
 
         return InsuranceCostResponse(
             declared_value=request.declared_value,
             category_type=request.category_type,
             published_at=request.published_at,
-            rate=result.rate,
+            rate=rate,
             insurance_cost=insurance_cost,
+            rate_published_at=rate_published_at,
+        )
+
+    async def _get_rate_as_of(
+        self,
+        effective_date: date,
+        category_type: str,
+    ) -> tuple[date, float] | None:
+        if self._rate_index.loaded:
+            return self._rate_index.as_of(category_type, effective_date)
+        return await self._tariff_repo.get_rate_as_of(effective_date, category_type)
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def calculate_insurance_cost_batch(
+        self,
+        requests: list[InsuranceCostRequest],
+    ) -> list[InsuranceCostResponse]:
+        if not requests:
+            return []
+
+        TARIFF_CALCULATE_BATCH_SIZE.observe(len(requests))
+        keys = {(request.published_at, request.category_type) for request in requests}
+        rates = await self._get_rates(keys)
+
+        if missing := keys - rates.keys():
+            logger.warning(f"Rates not found for {len(missing)} of {len(keys)} keys.")
+            raise HTTPException(
+                status_code=404,
+                detail="Rate not found for the given date and category type: "
+                + ", ".join(
+                    f"{published_at} {category_type}"
+                    for published_at, category_type in sorted(missing)
+                ),
+            )
+
+        responses = []
+        for request in requests:
+            rate = rates[(request.published_at, request.category_type)]
+            responses.append(
+                InsuranceCostResponse(
+                    declared_value=request.declared_value,
+                    category_type=request.category_type,
+                    published_at=request.published_at,
+                    rate=rate,
+                    insurance_cost=request.declared_value * rate,
+                    rate_published_at=request.published_at,
+                ),
+            )
+        if (skipped := self._calculate_batch_log_limit.acquire()) is not None:
+            logger.info(
+                "Insurance cost calculated for {} items ({} similar records skipped).",
+                len(responses),
+                skipped,
+            )
+
+        message = create_message(ActionType.CALCULATE_INSURANCE_COST_BATCH)
+        message["items"] = len(responses)
+        await self._kafka_producer.send_message(message)
+
+        return responses
+
+    async def _get_rates(
+        self,
+        keys: set[tuple[date, str]],
+    ) -> dict[tuple[date, str], float]:
+        rates = {}
+        for key in keys:
+            rate = self._rate_cache.get(key)
+            if rate is not None:
+                rates[key] = rate
+
+        if misses := keys - rates.keys():
+            generation = self._rate_cache.generation
+            db_rates = await self._tariff_repo.get_rates(misses)
+            for key, rate in db_rates.items():
+                self._rate_cache.put(key, rate, generation)
+            rates.update(db_rates)
+
+        return rates
+
+    async def _get_rate(self, published_at: date, category_type: str) -> float | None:
+        key = (published_at, category_type)
+        rate = self._rate_cache.get(key)
+        if rate is not None:
+            return rate
+
+        generation = self._rate_cache.generation
+        rate = await self._tariff_repo.get_rate(published_at, category_type)
+        if rate is None:
+            return None
+
+        self._rate_cache.put(key, rate, generation)
+        return rate
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def list_tariffs(
+        self,
+        date_from: date | None,
+        date_to: date | None,
+        category_type: str | None,
+        cursor: str | None,
+        limit: int,
+    ) -> TariffPage:
+        after = self._parse_cursor(cursor) if cursor else None
+        rows = await self._tariff_repo.list_tariffs(
+            date_from,
+            date_to,
+            category_type,
+            after,
+            limit,
+        )
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = f"{rows[-1].published_at.isoformat()}_{rows[-1].id}"
+        return TariffPage(
+            items=[TariffRecord.model_validate(row._asdict()) for row in rows],
+            next_cursor=next_cursor,
         )
 
-    async def get_tariff_by_id(self, tariff_id: UUID) -> Tariff | None:
+    @staticmethod
+    def _parse_cursor(cursor: str) -> tuple[date, UUID]:
+        try:
+            published_at, tariff_id = cursor.split("_", 1)
+            return date.fromisoformat(published_at), UUID(tariff_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    async def export_tariffs(
+        self,
+        date_from: date | None,
+        date_to: date | None,
+        category_type: str | None,
+        export_format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        """Выгрузка всех тарифов по фильтру в NDJSON или CSV пачками строк."""
+        if export_format is ExportFormat.CSV:
+            yield EXPORT_CSV_HEADER
+
+        async for rows in self._tariff_repo.iter_tariffs(
+            date_from,
+            date_to,
+            category_type,
+        ):
+            if export_format is ExportFormat.CSV:
+                yield self._rows_to_csv(rows)
+            else:
+                yield self._rows_to_ndjson(rows)
+
+    @staticmethod
+    def _rows_to_ndjson(rows: Sequence[Row]) -> bytes:
+        return b"".join(
+            orjson.dumps(row._asdict(), default=str) + b"\n" for row in rows
+        )
+
+    @staticmethod
+    def _rows_to_csv(rows: Sequence[Row]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
+    async def get_tariff_by_id(self, tariff_id: UUID) -> TariffRow:
         tariff = await self._tariff_repo.get_tariff_by_id(tariff_id)
         if not tariff:
             raise HTTPException(status_code=404, detail="Tariff not found")
         return tariff
 
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
     async def update_tariff(
         self,
         tariff_id: UUID,
         new_tariff: TariffBase,
     ) -> TariffResponse:
-        old_tariff = await self.get_tariff_by_id(tariff_id)
+        try:
+            updated = await self._tariff_repo.update_tariff(tariff_id, new_tariff)
+        except IntegrityError:
+            logger.warning(f"Duplicate tariff category for tariff {tariff_id}.")
+            raise HTTPException(status_code=409, detail=DUPLICATE_TARIFF_DETAIL)
 
-        if not old_tariff:
+        if updated is None:
             logger.warning(f"Tariff with ID {tariff_id} not found.")
             raise HTTPException(status_code=404, detail="Tariff not found")
 
-        old_tariff.category_type = new_tariff.category_type
-        old_tariff.rate = new_tariff.rate
-        updated_tariff = await self._tariff_repo.update_tariff(old_tariff)
+        published_at = updated.published_at
+        self._recent_imports.clear()
+        self._rate_cache.invalidate(
+            [
+                (published_at, updated.old_category_type),
+                (published_at, updated.category_type),
+            ],
+        )
+        self._rate_index.remove(published_at, updated.old_category_type)
+        self._rate_index.upsert(published_at, updated.category_type, updated.rate)
         logger.info(
-            f"Tariff with ID {tariff_id} updated successfully: {updated_tariff}.",
+            f"Tariff with ID {tariff_id} updated successfully: {updated}.",
         )
 
-        message = self._create_message(ActionType.UPDATE_TARIFF)
-
-        await self._kafka_producer.send_message(message)
-
         return TariffResponse(
-            id=updated_tariff.id,
-            published_at=old_tariff.date_accession.published_at,
+            id=updated.id,
+            published_at=published_at,
             tariffs=[
                 TariffBase(
-                    category_type=updated_tariff.category_type,
-                    rate=updated_tariff.rate,
+                    category_type=updated.category_type,
+                    rate=updated.rate,
                 ),
             ],
         )
 
+    @timed(TARIFF_SERVICE_SECONDS)
+    @traced("tariff_service")
     async def delete_tariff(self, tariff_id: UUID) -> dict[str, str]:
-        tariff = await self.get_tariff_by_id(tariff_id)
-        if not tariff:
+        deleted = await self._tariff_repo.delete_tariff(tariff_id)
+        if deleted is None:
             logger.warning(f"Tariff with ID {tariff_id} not found.")
             raise HTTPException(status_code=404, detail="Tariff not found")
 
-        await self._tariff_repo.delete_tariff(tariff)
-
-        message = self._create_message(ActionType.DELETE_TARIFF)
-        await self._kafka_producer.send_message(message)
+        key = (deleted.published_at, deleted.category_type)
+        self._recent_imports.clear()
+        self._rate_cache.invalidate([key])
+        self._rate_index.remove(*key)
 
         logger.info(f"Tariff with ID {tariff_id} has been deleted successfully.")
         return {"message": f"Tariff with ID {tariff_id} has been deleted."}
@@ -0,0 +1,129 @@
+import codecs
+import json
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Any, Protocol
+
+from app.models.tariff import TariffBase
+
+_WHITESPACE = " \t\n\r"
+
+
+class AsyncReader(Protocol):
+    async def read(self, size: int = -1) -> bytes:
+        pass
+
+
+class TariffStreamParser:
+    """
+    Инкрементальный разбор файла тарифов вида
+    ``{"2020-06-01": [{"category_type": ..., "rate": ...}, ...], ...}``.
+
+    Файл читается кусками по ``chunk_size`` байт, в памяти держится только
+    текущий кусок и тарифы одной даты. Ошибки формата поднимаются как ValueError.
+    """
+
+    def __init__(
+        self,
+        file: AsyncReader,
+        chunk_size: int = 64 * 1024,
+        max_value_size: int = 1024 * 1024,
+    ) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    async def groups(self) -> AsyncIterator[tuple[date, list[TariffBase]]]:
+        await self._expect("{")
+        if await self._peek() == "}":
+            self._pos += 1
+            await self._expect_eof()
+            return
+
+        while True:
+            key = await self._value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected date key, got {key!r}")
+            published_at = date.fromisoformat(key)
+
+            await self._expect(":")
+            await self._expect("[")
+            tariffs = []
+            if await self._peek() == "]":
+                self._pos += 1
+            else:
+                while True:
+                    tariffs.append(TariffBase.model_validate(await self._value()))
+                    if await self._expect(",]") == "]":
+                        break
+
+            yield published_at, tariffs
+
+            if await self._expect(",}") == "}":
+                break
+
+        await self._expect_eof()
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = await self._file.read(self._chunk_size)
+        self.bytes_read += len(chunk)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(
+            chunk,
+            final=self._eof,
+        )
+        self._pos = 0
+        return not self._eof
+
+    async def _peek(self) -> str:
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                return ""
+
+    async def _expect(self, chars: str) -> str:
+        char = await self._peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Expected one of {chars!r}, got {char or 'end of file'!r} "
+                f"at byte {self.bytes_read}",
+            )
+        self._pos += 1
+        return char
+
+    async def _expect_eof(self) -> None:
+        if await self._peek():
+            raise ValueError("Unexpected data after the end of JSON document")
+
+    async def _value(self) -> Any:
+        await self._peek()
+        while True:
+            try:
+                value, end = self._raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if len(self._buffer) - self._pos > self._max_value_size:
+                    raise
+                if await self._fill():
+                    continue
+                raise
+
+            # Число на границе куска могло прийти не целиком
+            if end == len(self._buffer) and await self._fill():
+                continue
+
+            self._pos = end
+            return value
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.utils.db import DbConfig
+from app.utils.tracing import TracingConfig
 
 
 @unique
@@ -16,22 +17,87 @@ class Environments(StrEnum):
     test = "test"
 
 
+@unique
+class KafkaBackpressure(StrEnum):
+    block = "block"
+    drop_oldest = "drop_oldest"
+    spill = "spill"
+
+
 class TGConfig(BaseModel):
     token: str = ""
     chat_id: str = ""
 
 
+class LoggingConfig(BaseModel):
+    level: str = "INFO"
+    # Запись в sink из фонового потока loguru, а не в вызывающем коде
+    enqueue: bool = True
+    file_path: str = "log.log"
+    file_level: str = "CRITICAL"
+    # Очередь сетевых sink'ов (Telegram, Sentry), сверх неё записи отбрасываются
+    notify_queue_size: int = 100
+    # Не больше стольких info-записей в секунду с места вызова на пути расчёта
+    # стоимости, None - без ограничения
+    pricing_logs_per_second: float | None = 10.0
+
+
 class KafkaConfig(BaseModel):
     host: str = ""
     port: int = 9092
     batch_size: int = 5
     topik: str = "default"
+    linger_ms: int = 5
+    max_batch_size: int = 16384
+    compression_type: str | None = None
+    queue_size: int = 10_000
+    flush_interval: float = 0.5
+    backpressure: KafkaBackpressure = KafkaBackpressure.block
+    spill_path: str = "kafka_spill.jsonl"
 
     @property
     def bootstrap_servers(self) -> str:
         return f"{self.host}:{self.port}"
 
 
+class RateCacheConfig(BaseModel):
+    max_size: int = 10_000
+    ttl: float = 60.0
+
+
+class RateSyncConfig(BaseModel):
+    # Изменения ставок от других реплик через LISTEN/NOTIFY (только Postgres)
+    listen: bool = True
+    # Пауза перед повторной загрузкой снимка после ошибки или обрыва соединения
+    reconnect_interval: float = 5.0
+
+
+class TariffImportConfig(BaseModel):
+    chunk_size: int = 64 * 1024
+    batch_rows: int = 5_000
+    # Файлы от parse_offload_bytes разбираются в пуле из parse_processes
+    # процессов частями около parse_shard_bytes, 0 процессов - всегда в event
+    # loop. Разбор в пуле дороже по CPU (модели возвращаются через pickle), зато
+    # не держит event loop всё время разбора
+    parse_processes: int = 0
+    parse_offload_bytes: int = 8 * 1024 * 1024
+    parse_shard_bytes: int = 1024 * 1024
+    # Сколько и как долго помнить хэши применённых upsert-загрузок
+    recent_imports_max_size: int = 1_000
+    recent_imports_ttl: float = 3600.0
+
+
+class ImportJobConfig(BaseModel):
+    max_concurrent: int = 2
+    max_queued: int = 10
+    max_finished: int = 1_000
+
+
+class OutboxConfig(BaseModel):
+    batch_size: int = 500
+    poll_interval: float = 1.0
+
+
 class AppConfig(BaseSettings):
     model_config = SettingsConfigDict(
         env_nested_delimiter="__",
@@ -43,6 +109,13 @@ class AppConfig(BaseSettings):
     environment: Environments = Environments.local
     db: DbConfig = DbConfig()
     kafka: KafkaConfig = KafkaConfig()
+    rate_cache: RateCacheConfig = RateCacheConfig()
+    rate_sync: RateSyncConfig = RateSyncConfig()
+    tariff_import: TariffImportConfig = TariffImportConfig()
+    import_jobs: ImportJobConfig = ImportJobConfig()
+    outbox: OutboxConfig = OutboxConfig()
+    tracing: TracingConfig = TracingConfig()
+    logging: LoggingConfig = LoggingConfig()
     sentry_dsn: str | None = None
     tg: TGConfig = TGConfig()
     cors_origin_regex: str = (
@@ -1,10 +1,144 @@
+import asyncio
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import suppress
+
+import notifiers
 from loguru import logger
-from notifiers.logging import NotificationHandler
 
-from app.settings import APP_CONFIG
+from app.settings import LoggingConfig, TGConfig
+from app.utils.metrics import LOG_RECORDS_DROPPED
+
+
+class QueuedSink:
+    """
+    Sink для сетевых получателей (Telegram, Sentry): запись только кладётся в
+    ограниченную очередь, отправляет её фоновый поток. Если получатель не
+    успевает, новые записи отбрасываются, а не копятся в памяти.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Callable[[str], object],
+        queue_size: int = 100,
+    ) -> None:
+        self.name = name
+        self._send = send
+        self._queue: queue.Queue[str | None] = queue.Queue(queue_size)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"log-sink-{name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def __call__(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(str(message))
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(sink=self.name, reason="queue_full").inc()
+
+    def _run(self) -> None:
+        while (message := self._queue.get()) is not None:
+            try:
+                self._send(message)
+            except Exception:
+                # Не через logger: ошибка снова попала бы в этот же sink
+                LOG_RECORDS_DROPPED.labels(sink=self.name, reason="send_error").inc()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Дожидается отправки накопленных записей, но не дольше ``timeout``."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class LogRateLimit:
+    """
+    Ограничение частоты записей с одного места вызова. ``acquire()`` возвращает
+    число пропущенных с прошлой записи сообщений или None, если писать сейчас
+    не нужно.
+    """
+
+    __slots__ = ("_interval", "_next_at", "_skipped")
+
+    def __init__(self, per_second: float | None) -> None:
+        self._interval = 1 / per_second if per_second else 0.0
+        self._next_at = 0.0
+        self._skipped = 0
+
+    def acquire(self) -> int | None:
+        now = time.monotonic()
+        if now < self._next_at:
+            self._skipped += 1
+            return None
+
+        self._next_at = now + self._interval
+        skipped, self._skipped = self._skipped, 0
+        return skipped
+
+
+# id обработчика loguru -> sink
+_queued_sinks: dict[int, QueuedSink] = {}
+
+
+def _telegram_sender(config: TGConfig) -> Callable[[str], object]:
+    telegram = notifiers.get_notifier("telegram", strict=True)
+    defaults = config.model_dump()
+    return lambda message: telegram.notify(
+        message=message,
+        raise_on_errors=True,
+        **defaults,
+    )
+
+
+def add_queued_sink(
+    name: str,
+    send: Callable[[str], object],
+    config: LoggingConfig,
+    level: str = "ERROR",
+) -> None:
+    sink = QueuedSink(name, send, config.notify_queue_size)
+    _queued_sinks[logger.add(sink, level=level)] = sink
+
+
+def _remove_queued_sinks() -> list[QueuedSink]:
+    sinks = []
+    while _queued_sinks:
+        handler_id, sink = _queued_sinks.popitem()
+        # Обработчик мог быть уже снят через logger.remove()
+        with suppress(ValueError):
+            logger.remove(handler_id)
+        sinks.append(sink)
+    return sinks
+
+
+def configure_logging(config: LoggingConfig, tg: TGConfig) -> None:
+    """
+    С ``enqueue`` запись в stderr и файл идёт из фонового потока loguru, а
+    сетевые sink'и отправляют сообщения из своих потоков через QueuedSink.
+    """
+    for sink in _remove_queued_sinks():
+        sink.stop()
+    logger.remove()
+    logger.add(sys.stderr, level=config.level, enqueue=config.enqueue)
+    logger.add(
+        config.file_path,
+        level=config.file_level,
+        rotation="10 MB",
+        enqueue=config.enqueue,
+    )
+    if tg.token and tg.chat_id:
+        add_queued_sink("telegram", _telegram_sender(tg), config)
 
-file_path_log = "log.log"
-logger.add(file_path_log, level="CRITICAL", rotation="10 MB")
 
-TG_HANDLER = NotificationHandler("telegram", defaults=APP_CONFIG.tg.model_dump())
-logger.add(TG_HANDLER, level="ERROR")
+async def shutdown_logging() -> None:
+    for sink in _remove_queued_sinks():
+        await asyncio.to_thread(sink.stop)
+    await logger.complete()
@@ -0,0 +1,169 @@
+import functools
+from collections.abc import Awaitable, Callable
+from typing import ParamSpec, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+SIZE_BUCKETS = (1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000)
+
+RATE_CACHE_HITS = Counter(
+    "tariff_rate_cache_hits",
+    "Number of rate lookups served from the in-process cache",
+)
+RATE_CACHE_MISSES = Counter(
+    "tariff_rate_cache_misses",
+    "Number of rate lookups that went to the database",
+)
+RATE_CACHE_EVICTIONS = Counter(
+    "tariff_rate_cache_evictions",
+    "Number of rate cache entries removed before being read again",
+    ["reason"],
+)
+RATE_SYNC_NOTIFICATIONS = Counter(
+    "tariff_rate_sync_notifications",
+    "Number of rate change notifications received from Postgres",
+    ["result"],
+)
+
+KAFKA_PRODUCER_QUEUE_DEPTH = Gauge(
+    "kafka_producer_queue_depth",
+    "Number of Kafka messages waiting in the producer queue",
+)
+KAFKA_PRODUCER_FLUSH_SECONDS = Histogram(
+    "kafka_producer_flush_seconds",
+    "Time spent sending one batch of queued Kafka messages",
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped",
+    "Number of log records dropped by background notification sinks",
+    ["sink", "reason"],
+)
+TRACE_SPANS_DROPPED = Counter(
+    "trace_spans_dropped",
+    "Number of finished spans dropped by the file exporter",
+    ["reason"],
+)
+
+KAFKA_PRODUCER_DROPPED = Counter(
+    "kafka_producer_dropped_messages",
+    "Number of Kafka messages dropped by the producer",
+    ["reason"],
+)
+KAFKA_PRODUCER_SPILLED = Counter(
+    "kafka_producer_spilled_messages",
+    "Number of Kafka messages written to the producer spill file",
+    ["reason"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Number of persistent connections configured for the database pool",
+    ["engine"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Number of database connections currently in use",
+    ["engine"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Number of database connections opened above the pool size",
+    ["engine"],
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Time spent executing one SQL statement",
+    ["engine", "query"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_STATEMENT_CACHE = Counter(
+    "db_statement_cache",
+    "SQLAlchemy compiled statement cache lookups",
+    ["query", "result"],
+)
+
+TARIFF_SERVICE_SECONDS = Histogram(
+    "tariff_service_seconds",
+    "Time spent in one TariffService operation",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+TARIFF_REPO_SECONDS = Histogram(
+    "tariff_repo_seconds",
+    "Time spent in one TariffRepo call, including pool checkout and commit",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+TARIFF_ROWS_INGESTED = Counter(
+    "tariff_rows_ingested",
+    "Number of tariff rows written",
+    ["mode"],
+)
+TARIFF_WRITE_BATCH_ROWS = Histogram(
+    "tariff_write_batch_rows",
+    "Number of tariff rows written in one transaction",
+    ["mode"],
+    buckets=SIZE_BUCKETS,
+)
+TARIFF_UPSERT_ROWS = Counter(
+    "tariff_upsert_rows",
+    "Number of tariff rows processed in upsert mode",
+    ["result"],
+)
+TARIFF_DELTA_ROWS = Counter(
+    "tariff_delta_rows",
+    "Number of tariff rows processed in delta mode",
+    ["result"],
+)
+TARIFF_DUPLICATE_IMPORTS = Counter(
+    "tariff_duplicate_imports",
+    "Number of upsert imports skipped because the same content was just applied",
+)
+TARIFF_UPLOAD_BYTES = Counter(
+    "tariff_upload_bytes",
+    "Size of uploaded tariff files",
+    ["mode"],
+)
+TARIFF_CALCULATE_BATCH_SIZE = Histogram(
+    "tariff_calculate_batch_size",
+    "Number of items in one batch insurance cost calculation",
+    buckets=SIZE_BUCKETS,
+)
+KAFKA_SEND_BATCH_SECONDS = Histogram(
+    "kafka_send_batch_seconds",
+    "Time spent sending one batch to Kafka until acknowledged",
+    buckets=LATENCY_BUCKETS,
+)
+KAFKA_SEND_BATCH_SIZE = Histogram(
+    "kafka_send_batch_size",
+    "Number of messages in one batch sent to Kafka",
+    buckets=SIZE_BUCKETS,
+)
+
+
+def timed(
+    histogram: Histogram,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Время выполнения корутины в ``histogram`` с меткой operation=имя функции."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        observed = histogram.labels(operation=func.__name__)
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with observed.time():
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,278 @@
+import asyncio
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from contextlib import AbstractContextManager, nullcontext, suppress
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from typing import Any, ParamSpec, Protocol, TypeVar
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.utils.metrics import TRACE_SPANS_DROPPED
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+class TracingExporter(StrEnum):
+    memory = "memory"
+    file = "file"
+
+
+class TracingConfig(BaseModel):
+    enabled: bool = False
+    exporter: TracingExporter = TracingExporter.file
+    file_path: str = "traces.jsonl"
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_time: float
+    duration: float = 0.0
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def traceparent(self) -> str:
+        """Контекст трассировки в формате W3C Trace Context."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemoryExporter:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+class FileExporter:
+    """
+    Завершённые спаны построчно в JSON, для локального разбора. ``export``
+    только кладёт спан в ограниченную очередь, в файл пачками пишет фоновый
+    поток. Если поток не успевает, новые спаны отбрасываются.
+    """
+
+    def __init__(self, path: str, queue_size: int = 10_000) -> None:
+        self._path = path
+        self._queue: queue.Queue[Span | None] = queue.Queue(queue_size)
+        self._thread = threading.Thread(
+            target=self._run,
+            name="span-exporter",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            TRACE_SPANS_DROPPED.labels(reason="queue_full").inc()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            spans = [self._queue.get()]
+            with suppress(queue.Empty):
+                while True:
+                    spans.append(self._queue.get_nowait())
+            stopped = None in spans
+            lines = [
+                json.dumps(asdict(span), default=str) + "\n"
+                for span in spans
+                if span is not None
+            ]
+            if not lines:
+                continue
+            try:
+                with open(self._path, "a", encoding="utf-8") as file:
+                    file.writelines(lines)
+            except OSError:
+                TRACE_SPANS_DROPPED.labels(reason="write_error").inc(len(lines))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Дожидается записи накопленных спанов, но не дольше ``timeout``."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def _parse_traceparent(traceparent: str | None) -> tuple[str, str] | None:
+    parts = traceparent.split("-") if traceparent else []
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+class _SpanContext:
+    __slots__ = ("_tracer", "_span", "_parent")
+
+    def __init__(self, tracer: "Tracer", span: Span, parent: Span | None) -> None:
+        self._tracer = tracer
+        self._span = span
+        self._parent = parent
+
+    def __enter__(self) -> Span:
+        _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        span = self._span
+        span.duration = time.time() - span.start_time
+        if exc_type is not None:
+            span.status = "error"
+            span.set_attribute("error", repr(exc))
+        # Не ContextVar.reset: выход может случиться в другом контексте
+        # (например, в итераторе StreamingResponse)
+        _current_span.set(self._parent)
+        self._tracer.export(span)
+
+
+class Tracer:
+    """
+    Минимальная трассировка в духе OpenTelemetry: вложенные спаны через
+    contextvars и передача контекста в заголовке ``traceparent``.
+    Пока экспортёр не задан, ``span()`` возвращает пустой контекстный менеджер.
+    """
+
+    def __init__(self) -> None:
+        self._exporter: SpanExporter | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._exporter is not None
+
+    @property
+    def exporter(self) -> SpanExporter | None:
+        return self._exporter
+
+    def configure(self, exporter: SpanExporter | None) -> None:
+        self._exporter = exporter
+
+    def export(self, span: Span) -> None:
+        if self._exporter is not None:
+            self._exporter.export(span)
+
+    def span(
+        self,
+        name: str,
+        traceparent: str | None = None,
+        **attributes: Any,
+    ) -> AbstractContextManager[Span | None]:
+        """
+        Новый спан внутри текущего. ``traceparent`` - контекст, пришедший
+        извне (HTTP-заголовок), используется если текущего спана нет.
+        """
+        if self._exporter is None:
+            return nullcontext()
+
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif remote := _parse_traceparent(traceparent):
+            trace_id, parent_id = remote
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent_id,
+            start_time=time.time(),
+            attributes=attributes,
+        )
+        return _SpanContext(self, span, parent)
+
+    @staticmethod
+    def current_traceparent() -> str | None:
+        span = _current_span.get()
+        return span.traceparent if span is not None else None
+
+
+tracer = Tracer()
+
+
+def configure_tracing(config: TracingConfig) -> None:
+    if not config.enabled:
+        tracer.configure(None)
+    elif config.exporter is TracingExporter.memory:
+        tracer.configure(InMemoryExporter())
+    else:
+        tracer.configure(FileExporter(config.file_path))
+
+
+async def shutdown_tracing() -> None:
+    exporter = tracer.exporter
+    tracer.configure(None)
+    if isinstance(exporter, FileExporter):
+        await asyncio.to_thread(exporter.stop)
+
+
+def traced(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Спан ``name.<имя функции>`` вокруг корутины."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        span_name = f"{name}.{func.__name__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracedRoute(APIRoute):
+    """Спан на каждый запрос к роуту с учётом входящего ``traceparent``."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        span_name = f"{next(iter(self.methods), '')} {self.path_format}"
+
+        async def traced_handler(request: Request) -> Response:
+            if not tracer.enabled:
+                return await handler(request)
+            with tracer.span(
+                span_name,
+                request.headers.get(TRACEPARENT_HEADER),
+            ) as span:
+                response = await handler(request)
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status_code)
+                return response
+
+        return traced_handler
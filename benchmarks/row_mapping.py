@@ -0,0 +1,141 @@
+"""
+Стоимость построения результата поиска тарифа: ORM-объекты с joinedload
+(как было в ``TariffRepo.get_tariff``) против выборки колонок в кортеж,
+slotted dataclass ``TariffRow`` и одной ставки (``TariffRepo.get_rate``).
+
+Все варианты выполняют запрос на одних и тех же ключах в одной сессии, так что
+разница - в основном CPU на разбор строк и построение объектов. Кроме задержки
+печатается процессорное время на запрос.
+
+    python -m benchmarks.row_mapping --lookups 5000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.orm_models import DateAccession, Tariff
+from app.repositories.tariff_repository import TARIFF_ROW_COLUMNS, TariffRow
+from app.settings import APP_CONFIG
+from app.utils.db import Db
+from benchmarks.tariff_lookup import report
+
+
+async def orm_lookup(session: AsyncSession, published_at: date, category: str) -> Any:
+    result = await session.execute(
+        select(Tariff)
+        .options(joinedload(Tariff.date_accession))
+        .join(DateAccession)
+        .where(DateAccession.published_at == published_at)
+        .where(Tariff.category_type == category),
+    )
+    tariff = result.scalar_one_or_none()
+    session.expunge_all()
+    return tariff
+
+
+async def tuple_lookup(session: AsyncSession, published_at: date, category: str) -> Any:
+    result = await session.execute(
+        select(*TARIFF_ROW_COLUMNS)
+        .join(DateAccession)
+        .where(DateAccession.published_at == published_at)
+        .where(Tariff.category_type == category),
+    )
+    return result.one_or_none()
+
+
+async def row_lookup(session: AsyncSession, published_at: date, category: str) -> Any:
+    row = await tuple_lookup(session, published_at, category)
+    return TariffRow(*row) if row is not None else None
+
+
+async def rate_lookup(session: AsyncSession, published_at: date, category: str) -> Any:
+    return await session.scalar(
+        select(Tariff.rate)
+        .join(DateAccession)
+        .where(DateAccession.published_at == published_at)
+        .where(Tariff.category_type == category),
+    )
+
+
+LOOKUPS: dict[str, Callable] = {
+    "ORM + joinedload": orm_lookup,
+    "core select -> tuple": tuple_lookup,
+    "core select -> TariffRow": row_lookup,
+    "core select -> rate": rate_lookup,
+}
+
+
+async def load_keys(db: Db, lookups: int) -> list[tuple[date, str]]:
+    async with db.get_session() as session:
+        first, last = (
+            await session.execute(
+                text(
+                    "SELECT min(published_at), max(published_at) FROM date_accessions"
+                ),
+            )
+        ).one()
+        categories = (
+            await session.scalars(
+                text("SELECT DISTINCT category_type FROM tariffs LIMIT 1000"),
+            )
+        ).all()
+    if first is None:
+        raise SystemExit(
+            "No tariffs, seed the database: python -m benchmarks.tariff_lookup"
+        )
+
+    days = (last - first).days + 1
+    return [
+        (first + timedelta(days=random.randrange(days)), random.choice(categories))
+        for _ in range(lookups)
+    ]
+
+
+async def measure(
+    db: Db,
+    name: str,
+    lookup: Callable,
+    keys: list[tuple[date, str]],
+) -> None:
+    timings = []
+    async with db.get_session() as session:
+        # Прогрев: кэш компиляции SQLAlchemy и подготовленные выражения asyncpg
+        for published_at, category in keys[:100]:
+            await lookup(session, published_at, category)
+
+        cpu_started = time.process_time()
+        for published_at, category in keys:
+            started = time.perf_counter()
+            await lookup(session, published_at, category)
+            timings.append(time.perf_counter() - started)
+        cpu = time.process_time() - cpu_started
+
+    report(name, timings)
+    print(f"{'':<28} cpu/lookup={cpu / len(keys) * 1_000_000:8.1f} us")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    db = Db(APP_CONFIG.db)
+    try:
+        keys = await load_keys(db, args.lookups)
+        for name, lookup in LOOKUPS.items():
+            await measure(db, name, lookup, keys)
+    finally:
+        await db.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Задержка поиска тарифа (get_tariff) на большой таблице.
+
+Заполняет БД из DB__DSN синтетическими тарифами (``--dates`` x ``--categories``
+строк, по умолчанию 10M), затем измеряет ``TariffRepo.get_tariff`` и тот же
+SELECT без индексов миграции 9d41c7b2e6a3 (ограничения удаляются внутри
+транзакции, которая откатывается).
+
+    alembic upgrade head
+    python -m benchmarks.tariff_lookup --dates 10000 --categories 1000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.repositories.tariff_repository import TariffRepo
+from app.settings import APP_CONFIG
+from app.utils.db import Db
+
+FIRST_DATE = date(2000, 1, 1)
+
+SEED_SQL = [
+    """
+    INSERT INTO date_accessions (id, published_at)
+    SELECT gen_random_uuid(), CAST(:first_date AS date) + g
+    FROM generate_series(0, :dates - 1) AS g
+    """,
+    """
+    INSERT INTO tariffs (id, category_type, rate, date_accession_id)
+    SELECT gen_random_uuid(), 'category_' || c, random(), d.id
+    FROM date_accessions AS d CROSS JOIN generate_series(0, :categories - 1) AS c
+    """,
+    "ANALYZE date_accessions",
+    "ANALYZE tariffs",
+]
+
+LOOKUP_SQL = text(
+    """
+    SELECT tariffs.rate FROM tariffs
+    JOIN date_accessions ON date_accessions.id = tariffs.date_accession_id
+    WHERE date_accessions.published_at = :published_at
+    AND tariffs.category_type = :category_type
+    """,
+)
+
+DROP_INDEXES_SQL = [
+    "ALTER TABLE tariffs DROP CONSTRAINT uq_tariffs_date_accession_id_category_type",
+    "ALTER TABLE date_accessions DROP CONSTRAINT uq_date_accessions_published_at",
+]
+
+
+def random_key(dates: int, categories: int) -> tuple[date, str]:
+    published_at = FIRST_DATE + timedelta(days=random.randrange(dates))
+    return published_at, f"category_{random.randrange(categories)}"
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    percentile = statistics.quantiles(timings, n=100)
+    print(
+        f"{name:<28} n={len(timings):<6} "
+        f"p50={percentile[49] * 1000:8.3f} ms  "
+        f"p99={percentile[98] * 1000:8.3f} ms  "
+        f"max={timings[-1] * 1000:8.3f} ms",
+    )
+
+
+async def seed(db: Db, dates: int, categories: int) -> None:
+    async with db.get_session() as session:
+        count = await session.scalar(text("SELECT count(*) FROM tariffs"))
+        if count:
+            print(f"Table tariffs already has {count} rows, seeding skipped.")
+            return
+
+        started = time.perf_counter()
+        params = {"first_date": FIRST_DATE, "dates": dates, "categories": categories}
+        for sql in SEED_SQL:
+            await session.execute(text(sql), params)
+        print(
+            f"Seeded {dates * categories} tariffs "
+            f"in {time.perf_counter() - started:.1f} s.",
+        )
+
+
+async def measure_repo(repo: TariffRepo, keys: list[tuple[date, str]]) -> list[float]:
+    timings = []
+    for published_at, category_type in keys:
+        started = time.perf_counter()
+        await repo.get_tariff(published_at, category_type)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def measure_sql(
+    db: Db,
+    keys: list[tuple[date, str]],
+    drop_indexes: bool,
+) -> list[float]:
+    timings = []
+    async with db.get_session() as session:
+        if drop_indexes:
+            for sql in DROP_INDEXES_SQL:
+                await session.execute(text(sql))
+
+        for published_at, category_type in keys:
+            params = {"published_at": published_at, "category_type": category_type}
+            started = time.perf_counter()
+            await session.execute(LOOKUP_SQL, params)
+            timings.append(time.perf_counter() - started)
+
+        plan = await session.execute(text(f"EXPLAIN {LOOKUP_SQL.text}"), params)
+        print("\n".join(row[0] for row in plan))
+        await session.rollback()
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dates", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=1_000)
+    parser.add_argument("--lookups", type=int, default=1_000)
+    parser.add_argument(
+        "--baseline-lookups",
+        type=int,
+        default=20,
+        help="lookups without indexes (each one is a full scan)",
+    )
+    args = parser.parse_args()
+
+    db = Db(APP_CONFIG.db)
+    try:
+        await seed(db, args.dates, args.categories)
+        keys = [random_key(args.dates, args.categories) for _ in range(args.lookups)]
+
+        report("TariffRepo.get_tariff", await measure_repo(TariffRepo(db), keys))
+        report("SELECT with indexes", await measure_sql(db, keys, drop_indexes=False))
+        report(
+            "SELECT without indexes",
+            await measure_sql(db, keys[: args.baseline_lookups], drop_indexes=True),
+        )
+    finally:
+        await db.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
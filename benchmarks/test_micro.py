@@ -0,0 +1,97 @@
+"""
+Микро-бенчмарки горячих участков без БД и Kafka.
+
+    make bench
+    pytest benchmarks --benchmark-json=benchmarks/results/micro.json
+
+Сравнение с прошлым запуском: ``--benchmark-compare`` (см. pytest-benchmark).
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app.kafka.producer import KafkaProducer
+from app.models.tariff import InsuranceCostRequest, TariffBase
+from app.services.tariff_service import TariffFileProcessor
+from app.settings import KafkaBackpressure
+
+pytest.importorskip("pytest_benchmark")
+
+DATES = 365
+CATEGORIES = 20
+MESSAGES = 1_000
+
+
+@pytest.fixture(scope="module")
+def tariff_file() -> bytes:
+    first = date(2020, 1, 1)
+    data = {
+        (first + timedelta(days=day)).isoformat(): [
+            {"category_type": f"category_{number}", "rate": number / 100}
+            for number in range(CATEGORIES)
+        ]
+        for day in range(DATES)
+    }
+    return json.dumps(data).encode()
+
+
+@pytest.fixture
+def quiet_logger():
+    from loguru import logger
+
+    logger.disable("app")
+    yield
+    logger.enable("app")
+
+
+def test_process_file(benchmark, tariff_file, quiet_logger):
+    tariffs = benchmark(TariffFileProcessor.process_file, tariff_file)
+    assert len(tariffs) == DATES
+
+
+def test_tariff_validation(benchmark):
+    rows = [
+        {"category_type": f"category_{number}", "rate": number / 100}
+        for number in range(CATEGORIES)
+    ] * 50
+
+    def validate() -> list[TariffBase]:
+        return [TariffBase.model_validate(row) for row in rows]
+
+    assert len(benchmark(validate)) == len(rows)
+
+
+def test_calculate_request_validation(benchmark):
+    payload = {
+        "declared_value": 1000.0,
+        "category_type": "Glass",
+        "published_at": "2020-06-01",
+    }
+    request = benchmark(InsuranceCostRequest.model_validate, payload)
+    assert request.published_at == date(2020, 6, 1)
+
+
+def test_kafka_send_message(benchmark, tmp_path):
+    """``MESSAGES`` вызовов send_message за раунд; очередь очищается между раундами."""
+    loop = asyncio.new_event_loop()
+    producer = KafkaProducer(
+        bootstrap_servers="localhost:9092",
+        queue_size=MESSAGES,
+        backpressure=KafkaBackpressure.drop_oldest,
+        spill_path=str(tmp_path / "spill.jsonl"),
+    )
+    message = {"user_id": None, "action": "calculate_insurance_cost"}
+
+    async def send() -> None:
+        for _ in range(MESSAGES):
+            await producer.send_message(message)
+        while not producer._queue.empty():
+            producer._queue.get_nowait()
+
+    try:
+        benchmark(lambda: loop.run_until_complete(send()))
+    finally:
+        loop.close()
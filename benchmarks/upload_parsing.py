@@ -0,0 +1,159 @@
+"""
+Пропускная способность разбора файла загрузки тарифов
+(``TariffFileProcessor.process_file``) на большом файле, по умолчанию ~100 МБ.
+
+Сравниваются:
+
+- ``json.loads`` + ``TariffBase(**tariff)`` + ``date.fromisoformat`` в цикле
+  (реализация до перехода на TypeAdapter);
+- ``orjson.loads`` + ``TypeAdapter.validate_python``;
+- ``TypeAdapter.validate_json`` - текущий ``process_file``.
+
+Затем ``process_file`` в event loop сравнивается с ``TariffParsePool`` из
+``--processes`` процессов: время разбора и самая долгая пауза event loop
+(задача, которая просыпается каждые 10 мс), пока идёт разбор.
+
+    python -m benchmarks.upload_parsing --size-mb 100 --repeat 3 --processes 4
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+
+import orjson
+from loguru import logger
+
+from app.models.tariff import TariffBase
+from app.services.tariff_parse_pool import TARIFF_FILE_ADAPTER, TariffParsePool
+from app.services.tariff_service import TariffFileProcessor
+from app.settings import TariffImportConfig
+
+FIRST_DATE = date(2000, 1, 1)
+
+
+def make_file(size_mb: int, categories: int) -> bytes:
+    tariffs = [
+        {"category_type": f"category_{number}", "rate": round(number / categories, 6)}
+        for number in range(categories)
+    ]
+    day_size = len(orjson.dumps(tariffs))
+    days = max(1, size_mb * 1024 * 1024 // day_size)
+    return orjson.dumps(
+        {
+            (FIRST_DATE + timedelta(days=day)).isoformat(): tariffs
+            for day in range(days)
+        },
+    )
+
+
+def stdlib_loop(contents: bytes) -> dict[date, list[TariffBase]]:
+    data = json.loads(contents)
+    return {
+        date.fromisoformat(date_str): [TariffBase(**tariff) for tariff in tariff_list]
+        for date_str, tariff_list in data.items()
+    }
+
+
+def orjson_validate_python(contents: bytes) -> dict[date, list[TariffBase]]:
+    return TARIFF_FILE_ADAPTER.validate_python(orjson.loads(contents))
+
+
+def measure(
+    name: str,
+    parse: Callable[[bytes], dict[date, list[TariffBase]]],
+    contents: bytes,
+    repeat: int,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        tariffs = parse(contents)
+        timings.append(time.perf_counter() - started)
+        rows = sum(len(tariff_list) for tariff_list in tariffs.values())
+        del tariffs
+
+    best = min(timings)
+    megabytes = len(contents) / 1024 / 1024
+    print(
+        f"{name:<28} best={best:7.3f} s  {megabytes / best:7.1f} MB/s  "
+        f"{rows / best / 1000:8.1f}k rows/s",
+    )
+    return best
+
+
+async def measure_loop_stall(
+    name: str,
+    parse: Callable[[], Awaitable[object]],
+) -> None:
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stall = max(stall, time.perf_counter() - started - 0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    gc.collect()
+    started = time.perf_counter()
+    await parse()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker_task
+    print(f"{name:<28} total={elapsed:7.3f} s  max loop stall={stall * 1000:8.1f} ms")
+
+
+async def compare_pool(contents: bytes, processes: int) -> None:
+    async def in_loop() -> object:
+        return TariffFileProcessor.process_file(contents)
+
+    pool = TariffParsePool(TariffImportConfig(parse_processes=processes))
+    try:
+        # Первый вызов запускает процессы пула
+        await pool.parse(b"{}")
+        await measure_loop_stall("process_file in event loop", in_loop)
+        await measure_loop_stall(
+            f"TariffParsePool x{processes}",
+            lambda: pool.parse(contents),
+        )
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--categories", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    logger.disable("app")
+    contents = make_file(args.size_mb, args.categories)
+    print(f"File: {len(contents) / 1024 / 1024:.1f} MB")
+
+    baseline = measure("json.loads + TariffBase()", stdlib_loop, contents, args.repeat)
+    for name, parse in (
+        ("orjson + validate_python", orjson_validate_python),
+        ("validate_json (process_file)", TariffFileProcessor.process_file),
+    ):
+        best = measure(name, parse, contents, args.repeat)
+        print(f"{'':<28} x{baseline / best:.2f} vs json.loads + TariffBase()")
+
+    if args.processes > 0:
+        asyncio.run(compare_pool(contents, args.processes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""tariff lookup indexes
+
+Revision ID: 9d41c7b2e6a3
+Revises: 5c2f9a8e1d47
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c7b2e6a3'
+down_revision: Union[str, None] = '5c2f9a8e1d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Категории одной даты с разными ставками: какую оставить, решает оператор
+CONFLICTS_QUERY = """
+    SELECT d.published_at, t.category_type, count(*) AS rows, count(DISTINCT t.rate) AS rates
+    FROM tariffs t JOIN date_accessions d ON d.id = t.date_accession_id
+    GROUP BY d.published_at, t.category_type
+    HAVING count(DISTINCT t.rate) > 1
+"""
+
+
+def upgrade() -> None:
+    pairs, rows = op.get_bind().execute(
+        sa.text(f"SELECT count(*), coalesce(sum(rows), 0) FROM ({CONFLICTS_QUERY}) c")
+    ).one()
+    if pairs:
+        raise RuntimeError(
+            f"{pairs} date/category pairs ({rows} tariffs) have different rates, "
+            f"resolve them before upgrading. List them with: {' '.join(CONFLICTS_QUERY.split())}"
+        )
+
+    # Склеиваем повторные date_accessions одной даты в одну запись
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE date_accession_merge ON COMMIT DROP AS
+        SELECT id, first_value(id) OVER (PARTITION BY published_at ORDER BY id) AS keep_id
+        FROM date_accessions
+        """
+    )
+    op.execute(
+        """
+        UPDATE tariffs SET date_accession_id = m.keep_id
+        FROM date_accession_merge m
+        WHERE tariffs.date_accession_id = m.id AND m.id <> m.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM date_accessions USING date_accession_merge m
+        WHERE date_accessions.id = m.id AND m.id <> m.keep_id
+        """
+    )
+    # Остались только точные повторы (та же ставка) - оставляем одну строку
+    op.execute(
+        """
+        DELETE FROM tariffs USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY date_accession_id, category_type, rate ORDER BY id
+            ) AS position
+            FROM tariffs
+        ) d
+        WHERE tariffs.id = d.id AND d.position > 1
+        """
+    )
+
+    op.create_unique_constraint('uq_date_accessions_published_at', 'date_accessions', ['published_at'])
+    op.create_unique_constraint('uq_tariffs_date_accession_id_category_type', 'tariffs', ['date_accession_id', 'category_type'])
+
+
+def downgrade() -> None:
+    # Склеенные повторы не восстанавливаем: они совпадали с оставленными строками
+    op.drop_constraint('uq_tariffs_date_accession_id_category_type', 'tariffs', type_='unique')
+    op.drop_constraint('uq_date_accessions_published_at', 'date_accessions', type_='unique')
@@ -0,0 +1,26 @@
+"""outbox traceparent
+
+Revision ID: 3e8b5f2a7c19
+Revises: 9d41c7b2e6a3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b5f2a7c19'
+down_revision: Union[str, None] = '9d41c7b2e6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox', sa.Column('traceparent', sa.String(length=55), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox', 'traceparent')
@@ -5,7 +5,13 @@ import sentry_sdk
 
 from app.kafka.producer import KafkaProducer
 from app.repositories.tariff_repository import TariffRepo
+from app.services.import_job_service import ImportJobService
+from app.services.rate_cache import RateCache
+from app.services.rate_index import RateIndex
+from app.services.recent_imports import RecentImports
+from app.services.tariff_parse_pool import TariffParsePool
 from app.services.tariff_service import TariffService
+from app.settings import ImportJobConfig, LoggingConfig, TariffImportConfig
 from app.utils.db import Db
 from tests.utils import load_json
 
@@ -32,11 +38,74 @@ def kafka_producer_mock():
 
 
 @pytest.fixture
-def tariff_service_mock(kafka_producer_mock, tariff_repository_mock):
-    return TariffService(tariff_repository_mock, kafka_producer_mock)
+def rate_cache():
+    return RateCache(max_size=100, ttl=60)
+
+
+@pytest.fixture
+def rate_index():
+    return RateIndex()
+
+
+@pytest.fixture
+def import_config():
+    return TariffImportConfig(chunk_size=16, batch_rows=2)
+
+
+@pytest.fixture
+def parse_pool(import_config):
+    pool = TariffParsePool(import_config)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def recent_imports():
+    return RecentImports(max_size=10, ttl=60)
+
+
+@pytest.fixture
+def logging_config():
+    return LoggingConfig()
+
+
+@pytest.fixture
+def tariff_service_mock(
+    kafka_producer_mock,
+    tariff_repository_mock,
+    rate_cache,
+    rate_index,
+    import_config,
+    logging_config,
+    parse_pool,
+    recent_imports,
+):
+    return TariffService(
+        tariff_repository_mock,
+        kafka_producer_mock,
+        rate_cache,
+        rate_index,
+        import_config,
+        logging_config,
+        parse_pool,
+        recent_imports,
+    )
 
 
 @pytest.fixture
 def json_data_tariff() -> dict:
     address = load_json("mocked_data/tariff.json")
     return address
+
+
+@pytest.fixture
+def import_job_service_mock():
+    return AsyncMock(autospec=ImportJobService)
+
+
+@pytest.fixture
+def import_job_service(tariff_service_mock):
+    return ImportJobService(
+        tariff_service_mock,
+        ImportJobConfig(max_concurrent=1, max_queued=1),
+    )
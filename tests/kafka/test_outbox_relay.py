@@ -0,0 +1,19 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.kafka.outbox_relay import OutboxRelay
+from app.settings import OutboxConfig
+
+
+@pytest.mark.asyncio
+async def test_relay_once_publishes_through_producer(kafka_producer_mock):
+    outbox_repo = AsyncMock()
+    outbox_repo.publish_batch.return_value = 2
+    relay = OutboxRelay(outbox_repo, kafka_producer_mock, OutboxConfig(batch_size=10))
+
+    assert await relay.relay_once() == 2
+    outbox_repo.publish_batch.assert_awaited_once_with(
+        10,
+        kafka_producer_mock.send_messages,
+    )
@@ -0,0 +1,189 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.kafka.producer import KafkaProducer
+from app.settings import KafkaBackpressure
+
+
+def make_producer(tmp_path, **kwargs) -> KafkaProducer:
+    producer = KafkaProducer(
+        bootstrap_servers="localhost:9092",
+        default_topic="test",
+        spill_path=str(tmp_path / "spill.jsonl"),
+        **kwargs,
+    )
+    kafka = AsyncMock()
+    kafka.send.side_effect = lambda *args, **kwargs: resolved_future()
+    producer.producer = kafka
+    return producer
+
+
+def resolved_future() -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(None)
+    return future
+
+
+def sent_messages(producer: KafkaProducer) -> list[dict]:
+    assert producer.producer is not None
+    return [json.loads(call.args[1]) for call in producer.producer.send.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_flusher_sends_full_batch(tmp_path):
+    producer = make_producer(tmp_path, batch_size=3, flush_interval=10)
+    producer.start_flusher()
+
+    for number in range(3):
+        await producer.send_message({"number": number})
+    await asyncio.sleep(0.01)
+
+    assert sent_messages(producer) == [{"number": 0}, {"number": 1}, {"number": 2}]
+    producer.producer.send_and_wait.assert_not_called()
+    await producer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flusher_sends_partial_batch_after_interval(tmp_path):
+    producer = make_producer(tmp_path, batch_size=100, flush_interval=0.01)
+    producer.start_flusher()
+
+    await producer.send_message({"number": 1})
+    producer.producer.send.assert_not_called()
+    await asyncio.sleep(0.05)
+
+    assert sent_messages(producer) == [{"number": 1}]
+    await producer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue(tmp_path):
+    producer = make_producer(tmp_path, batch_size=100)
+
+    await producer.send_message({"number": 1})
+    await producer.send_message({"number": 2}, topic="other")
+    await producer.stop()
+
+    assert producer.producer.send.await_count == 2
+    producer.producer.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_drop_oldest(tmp_path):
+    producer = make_producer(
+        tmp_path,
+        queue_size=2,
+        backpressure=KafkaBackpressure.drop_oldest,
+    )
+
+    for number in range(3):
+        await producer.send_message({"number": number})
+    await producer.stop()
+
+    assert sent_messages(producer) == [{"number": 1}, {"number": 2}]
+
+
+@pytest.mark.asyncio
+async def test_backpressure_spill(tmp_path):
+    producer = make_producer(
+        tmp_path,
+        queue_size=2,
+        backpressure=KafkaBackpressure.spill,
+    )
+
+    for number in range(3):
+        await producer.send_message({"number": number})
+    assert (tmp_path / "spill.jsonl").exists()
+    await producer.stop()
+
+    assert sent_messages(producer) == [{"number": 0}, {"number": 1}, {"number": 2}]
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_spilled_and_retried(tmp_path):
+    producer = make_producer(tmp_path, batch_size=2, flush_interval=10)
+    failures = [ConnectionError("broker is down")]
+
+    def send(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return resolved_future()
+
+    producer.producer.send.side_effect = send
+    producer.start_flusher()
+
+    for number in range(2):
+        await producer.send_message({"number": number})
+    await asyncio.sleep(0.05)
+
+    assert sent_messages(producer)[1:] == [{"number": 0}, {"number": 1}]
+    assert not (tmp_path / "spill.jsonl").exists()
+    await producer.stop()
+
+
+@pytest.mark.asyncio
+async def test_replay_leaves_overflow_in_spill(tmp_path):
+    producer = make_producer(
+        tmp_path,
+        queue_size=2,
+        backpressure=KafkaBackpressure.spill,
+    )
+    for number in range(5):
+        await producer.send_message({"number": number})
+    producer._queue.get_nowait()
+
+    await producer._replay_spill()
+
+    assert producer._queue.full()
+    spilled = (tmp_path / "spill.jsonl").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in spilled] == [
+        '{"number": 3}',
+        '{"number": 4}',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_corrupt_lines(tmp_path):
+    producer = make_producer(tmp_path)
+    (tmp_path / "spill.jsonl").write_text(
+        '{"topic": "test", "mess\n'
+        '{"topic": "test", "message": "{\\"number\\": 1}", "traceparent": null}\n',
+    )
+
+    await producer._replay_spill()
+
+    assert producer._queue.get_nowait() == ("test", (b'{"number": 1}', None))
+    assert producer._queue.empty()
+    assert not (tmp_path / "spill.jsonl").exists()
+    assert not (tmp_path / "spill.jsonl.replay").exists()
+
+
+@pytest.mark.asyncio
+async def test_flusher_survives_replay_error(tmp_path, monkeypatch):
+    producer = make_producer(tmp_path, batch_size=1, flush_interval=10)
+    replay = AsyncMock(side_effect=[OSError("disk is gone"), None])
+    monkeypatch.setattr(producer, "_replay_spill", replay)
+    producer.start_flusher()
+
+    for number in range(2):
+        await producer.send_message({"number": number})
+        await asyncio.sleep(0.01)
+
+    assert sent_messages(producer) == [{"number": 0}, {"number": 1}]
+    assert replay.await_count == 2
+    await producer.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_messages_waits_for_acks(tmp_path):
+    producer = make_producer(tmp_path)
+    await producer.send_messages(
+        [(None, {"number": 1}, None), ("other", {"number": 2}, None)],
+    )
+
+    topics = [call.args[0] for call in producer.producer.send.await_args_list]
+    assert topics == ["test", "other"]
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.tariff import TariffBase
+from app.orm_models import DateAccession, OutboxEvent, Tariff
+from app.repositories.tariff_repository import TariffRepo
+from app.utils.db import Db, DbConfig
+
+
+async def count(db: Db, model: type) -> int:
+    async with db.read_session() as session:
+        return await session.scalar(select(func.count()).select_from(model)) or 0
+
+
+@pytest.mark.asyncio
+async def test_empty_import_writes_nothing(tmp_path):
+    db = Db(DbConfig(dsn=f"sqlite+aiosqlite:///{tmp_path / 'db'}.db"))
+    repo = TariffRepo(db)
+    try:
+        await db._create_table()
+
+        assert await repo.add_tariffs_bulk({}) == {}
+        assert await repo.upsert_tariffs({}) == []
+        assert await repo.apply_tariff_delta({}) == ([], [])
+
+        # Пустой INSERT дат создал бы дату по умолчанию (CURRENT_DATE)
+        assert await count(db, DateAccession) == 0
+        assert await count(db, OutboxEvent) == 0
+    finally:
+        await db.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_add_tariffs_bulk(tmp_path):
+    db = Db(DbConfig(dsn=f"sqlite+aiosqlite:///{tmp_path / 'db'}.db"))
+    repo = TariffRepo(db)
+    tariff_data = {
+        date(2023, 10, 1): [
+            TariffBase(category_type="type1", rate=0.5),
+            TariffBase(category_type="type2", rate=0.3),
+        ],
+        date(2023, 11, 1): [TariffBase(category_type="type1", rate=0.4)],
+    }
+    try:
+        await db._create_table()
+
+        accession_ids = await repo.add_tariffs_bulk(tariff_data)
+
+        async with db.read_session() as session:
+            rows = await session.execute(
+                select(
+                    DateAccession.published_at,
+                    Tariff.category_type,
+                    Tariff.rate,
+                    Tariff.date_accession_id,
+                )
+                .join(Tariff.date_accession)
+                .order_by(DateAccession.published_at, Tariff.category_type),
+            )
+            tariffs = rows.all()
+        events = await count(db, OutboxEvent)
+    finally:
+        await db.shutdown()
+
+    assert accession_ids.keys() == tariff_data.keys()
+    assert [tuple(row[:3]) for row in tariffs] == [
+        (date(2023, 10, 1), "type1", 0.5),
+        (date(2023, 10, 1), "type2", 0.3),
+        (date(2023, 11, 1), "type1", 0.4),
+    ]
+    assert all(row[3] == accession_ids[row[0]] for row in tariffs)
+    assert events == 2
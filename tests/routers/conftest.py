@@ -1,11 +1,17 @@
+from unittest.mock import MagicMock
+
 import pytest
 from punq import Container, Scope
 from starlette.testclient import TestClient
 
+from app.kafka.outbox_relay import OutboxRelay
 from app.kafka.producer import KafkaProducer
 from app.repositories.tariff_repository import TariffRepo
 from app.routers.default_router import DefaultRouter
 from app.routers.tariff_router import TariffRouter
+from app.services.import_job_service import ImportJobService
+from app.services.rate_index import RateIndex
+from app.services.rate_sync import RateSync
 from app.services.tariff_service import TariffService
 from app.settings import AppConfig
 from app.utils.db import Db
@@ -18,6 +24,8 @@ def client(
     kafka_producer_mock,
     tariff_repository_mock,
     tariff_service_mock,
+    import_job_service_mock,
+    rate_index,
 ):
     def bootstrap_mock(app_config: AppConfig):
         container = Container()
@@ -36,7 +44,11 @@ def client(
         container.register(TariffRouter, TariffRouter)
 
         container.register(TariffService, instance=tariff_service_mock)
+        container.register(ImportJobService, instance=import_job_service_mock)
+        container.register(OutboxRelay, instance=MagicMock(autospec=OutboxRelay))
         container.register(TariffRepo, instance=tariff_repository_mock)
+        container.register(RateIndex, instance=rate_index)
+        container.register(RateSync, instance=MagicMock(autospec=RateSync))
 
         return container
 
@@ -1,4 +1,32 @@
+import contextlib
+from unittest.mock import AsyncMock
+
+from app.services.rate_index import RateIndex
+from app.utils.db import Db
+
+
 def test_ping(client):
     response = client.get("/default/ping")
     assert response.status_code == 200
     assert response.json() == "pong"
+
+
+def test_ready_waits_for_rate_snapshot(client, monkeypatch):
+    # main импортируется один раз: зависимости берём из его контейнера
+    from main import container
+
+    @contextlib.asynccontextmanager
+    async def get_session():
+        yield AsyncMock()
+
+    monkeypatch.setattr(container.resolve(Db), "get_session", get_session)
+    rate_index = container.resolve(RateIndex)
+    monkeypatch.setattr(rate_index, "loaded", False)
+
+    response = client.get("/default/ready")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Rate snapshot not loaded"}
+
+    monkeypatch.setattr(rate_index, "loaded", True)
+    response = client.get("/default/ready")
+    assert response.status_code == 200
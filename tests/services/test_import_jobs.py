@@ -0,0 +1,73 @@
+import asyncio
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.models.import_job import ImportJobStatus
+from app.models.tariff import TariffImportSummary
+
+
+def upload_file() -> UploadFile:
+    return UploadFile(BytesIO(b'{"2020-06-01": []}'), filename="tariffs.json")
+
+
+@pytest.mark.asyncio
+async def test_import_job_completed(import_job_service, tariff_service_mock):
+    async def upload_tariff_stream(file, on_progress):
+        assert await file.read() == b'{"2020-06-01": []}'
+        on_progress(TariffImportSummary(dates=1, tariffs=3), 18)
+        return TariffImportSummary(dates=1, tariffs=3)
+
+    tariff_service_mock.upload_tariff_stream = upload_tariff_stream
+
+    job = await import_job_service.submit(upload_file())
+    assert job.status is ImportJobStatus.PENDING
+    await asyncio.gather(*import_job_service._tasks)
+
+    job = import_job_service.get(job.id)
+    assert job.status is ImportJobStatus.COMPLETED
+    assert job.tariffs_processed == 3
+    assert job.bytes_processed == 18
+    assert job.errors == []
+
+
+@pytest.mark.asyncio
+async def test_import_job_failed(import_job_service, tariff_service_mock):
+    async def upload_tariff_stream(file, on_progress):
+        raise HTTPException(status_code=400, detail="Invalid tariff file")
+
+    tariff_service_mock.upload_tariff_stream = upload_tariff_stream
+
+    job = await import_job_service.submit(upload_file())
+    await asyncio.gather(*import_job_service._tasks)
+
+    assert job.status is ImportJobStatus.FAILED
+    assert job.errors == ["Invalid tariff file"]
+
+
+@pytest.mark.asyncio
+async def test_import_job_limit(import_job_service, tariff_service_mock):
+    release = asyncio.Event()
+
+    async def upload_tariff_stream(file, on_progress):
+        await release.wait()
+
+    tariff_service_mock.upload_tariff_stream = upload_tariff_stream
+
+    # max_concurrent=1 и max_queued=1
+    await import_job_service.submit(upload_file())
+    await import_job_service.submit(upload_file())
+    with pytest.raises(HTTPException) as exc_info:
+        await import_job_service.submit(upload_file())
+    assert exc_info.value.status_code == 429
+
+    release.set()
+    await asyncio.gather(*import_job_service._tasks)
+
+
+def test_import_job_not_found(import_job_service):
+    with pytest.raises(HTTPException) as exc_info:
+        import_job_service.get(uuid4())
+    assert exc_info.value.status_code == 404
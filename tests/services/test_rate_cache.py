@@ -0,0 +1,83 @@
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.models.tariff import InsuranceCostRequest, TariffBase
+from app.orm_models import Tariff
+from app.services.rate_cache import RateCache
+
+KEY = (date(2023, 10, 1), "type1")
+
+
+def test_rate_cache_get_put():
+    cache = RateCache(max_size=10, ttl=60)
+    assert cache.get(KEY) is None
+
+    cache.put(KEY, 0.5)
+    assert cache.get(KEY) == 0.5
+
+
+def test_rate_cache_evicts_least_recently_used():
+    cache = RateCache(max_size=2, ttl=60)
+    cache.put((date(2023, 10, 1), "a"), 0.1)
+    cache.put((date(2023, 10, 1), "b"), 0.2)
+    cache.get((date(2023, 10, 1), "a"))
+    cache.put((date(2023, 10, 1), "c"), 0.3)
+
+    assert len(cache) == 2
+    assert cache.get((date(2023, 10, 1), "b")) is None
+    assert cache.get((date(2023, 10, 1), "a")) == 0.1
+
+
+def test_rate_cache_ttl_expired():
+    cache = RateCache(max_size=10, ttl=0)
+    cache.put(KEY, 0.5)
+    assert cache.get(KEY) is None
+    assert len(cache) == 0
+
+
+def test_rate_cache_rejects_put_after_invalidate():
+    cache = RateCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate([KEY])
+    cache.put(KEY, 0.5, generation)
+    assert cache.get(KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_calculate_insurance_cost_uses_cache(tariff_service_mock):
+    tariff_service_mock._tariff_repo.get_rate.return_value = 0.5
+    request = InsuranceCostRequest(
+        declared_value=1000,
+        category_type="type1",
+        published_at=date(2023, 10, 1),
+    )
+
+    await tariff_service_mock.calculate_insurance_cost(request)
+    response = await tariff_service_mock.calculate_insurance_cost(request)
+
+    assert response.insurance_cost == 500.0
+    tariff_service_mock._tariff_repo.get_rate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_operations_invalidate_cache(tariff_service_mock, rate_cache):
+    rate_cache.put(KEY, 0.5)
+    tariff_service_mock._tariff_repo.add_tariffs_with_date_accession.return_value = [
+        Tariff(id=uuid4(), date_accession_id=uuid4()),
+    ]
+    await tariff_service_mock.create_tariff(
+        {date(2023, 10, 1): [TariffBase(category_type="type1", rate=0.6)]},
+    )
+    assert rate_cache.get(KEY) is None
+
+    rate_cache.put(KEY, 0.6)
+    tariff_service_mock._tariff_repo.delete_tariff.return_value = SimpleNamespace(
+        id=uuid4(),
+        published_at=date(2023, 10, 1),
+        category_type="type1",
+    )
+    await tariff_service_mock.delete_tariff(uuid4())
+    assert rate_cache.get(KEY) is None
@@ -0,0 +1,83 @@
+from datetime import date
+
+import pytest
+
+from app.models.tariff import InsuranceCostRequest
+from app.services.rate_index import RateIndex
+
+
+async def rows(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_rate_index_as_of():
+    index = RateIndex()
+    await index.load(
+        rows(
+            [
+                (date(2023, 10, 1), "type1", 0.5),
+                (date(2023, 9, 1), "type1", 0.4),
+                (date(2023, 10, 1), "type2", 0.7),
+            ],
+        ),
+    )
+
+    assert index.loaded
+    assert len(index) == 3
+    assert index.as_of("type1", date(2023, 8, 31)) is None
+    assert index.as_of("type1", date(2023, 9, 15)) == (date(2023, 9, 1), 0.4)
+    assert index.as_of("type1", date(2024, 1, 1)) == (date(2023, 10, 1), 0.5)
+    assert index.as_of("type3", date(2024, 1, 1)) is None
+
+
+def test_rate_index_upsert_and_remove():
+    index = RateIndex()
+    index.upsert(date(2023, 10, 1), "type1", 0.5)
+    index.upsert(date(2023, 9, 1), "type1", 0.4)
+    index.upsert(date(2023, 10, 1), "type1", 0.6)
+    assert index.as_of("type1", date(2023, 10, 2)) == (date(2023, 10, 1), 0.6)
+
+    index.remove(date(2023, 10, 1), "type1")
+    assert index.as_of("type1", date(2023, 10, 2)) == (date(2023, 9, 1), 0.4)
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_calculate_insurance_cost_as_of(tariff_service_mock, rate_index):
+    await rate_index.load(rows([(date(2023, 9, 1), "type1", 0.5)]))
+    request = InsuranceCostRequest(
+        declared_value=1000,
+        category_type="type1",
+        published_at=date(2023, 10, 1),
+    )
+
+    response = await tariff_service_mock.calculate_insurance_cost(request, as_of=True)
+
+    assert response.insurance_cost == 500.0
+    assert response.rate_published_at == date(2023, 9, 1)
+    tariff_service_mock._tariff_repo.get_rate_as_of.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_calculate_insurance_cost_as_of_falls_back_to_repo(
+    tariff_service_mock,
+):
+    tariff_service_mock._tariff_repo.get_rate_as_of.return_value = (
+        date(2023, 9, 1),
+        0.5,
+    )
+    request = InsuranceCostRequest(
+        declared_value=1000,
+        category_type="type1",
+        published_at=date(2023, 10, 1),
+    )
+
+    response = await tariff_service_mock.calculate_insurance_cost(request, as_of=True)
+
+    assert response.rate_published_at == date(2023, 9, 1)
+    tariff_service_mock._tariff_repo.get_rate_as_of.assert_awaited_once_with(
+        date(2023, 10, 1),
+        "type1",
+    )
@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.import_mode import ImportMode
+from app.models.tariff import TariffBase
+from app.repositories.tariff_repository import (
+    parse_rate_changes,
+    rate_change_payloads,
+    RATE_CHANGES_PER_NOTIFY,
+    TariffUpsertRow,
+)
+from app.services.rate_sync import RateSync
+from app.settings import RateSyncConfig
+
+CHANGES = [(date(2023, 10, 1), "type1", 0.5), (date(2023, 10, 1), "type2", None)]
+
+
+def test_rate_change_payloads():
+    changes = [
+        (date(2023, 10, 1), f"{number:032}", number / 1000)
+        for number in range(RATE_CHANGES_PER_NOTIFY * 2 + 1)
+    ]
+
+    payloads = rate_change_payloads(changes, origin="replica")
+
+    assert len(payloads) == 3
+    # payload NOTIFY ограничен 8000 байтами
+    assert max(len(payload.encode()) for payload in payloads) < 8000
+    parsed = [parse_rate_changes(payload) for payload in payloads]
+    assert {origin for origin, _ in parsed} == {"replica"}
+    assert [change for _, part in parsed for change in part] == changes
+
+
+def test_apply_rate_changes(tariff_service_mock, rate_cache, rate_index):
+    rate_index.upsert(date(2023, 10, 1), "type2", 0.9)
+    rate_cache.put((date(2023, 10, 1), "type1"), 0.1, rate_cache.generation)
+
+    tariff_service_mock.apply_rate_changes(CHANGES)
+
+    assert rate_cache.get((date(2023, 10, 1), "type1")) is None
+    assert rate_index.as_of("type1", date(2023, 10, 1)) == (date(2023, 10, 1), 0.5)
+    assert rate_index.as_of("type2", date(2023, 10, 1)) is None
+
+
+class FakeListenDb:
+    supports_listen = True
+
+    def __init__(self) -> None:
+        self.notify = None
+        self.close = None
+        self.connections = 0
+
+    @contextlib.asynccontextmanager
+    async def listen(self, channel, callback, on_close):
+        self.connections += 1
+        self.notify, self.close = callback, on_close
+        yield
+
+
+@pytest.mark.asyncio
+async def test_rate_sync_buffers_changes_during_load():
+    db = FakeListenDb()
+    tariff_service = MagicMock()
+    applied = []
+    tariff_service.apply_rate_changes.side_effect = (
+        lambda changes, from_other_replica=True: applied.append(
+            (changes, from_other_replica),
+        )
+    )
+
+    async def load_rate_index() -> None:
+        if db.connections == 1:
+            # Изменения приходят, пока читается снимок: свои тоже применяются,
+            # иначе замена снимка потеряла бы их
+            db.notify(rate_change_payloads(CHANGES[:1], origin="replica")[0])
+            db.notify(rate_change_payloads(CHANGES[1:])[0])
+            assert applied == []
+
+    tariff_service.load_rate_index = AsyncMock(side_effect=load_rate_index)
+    rate_sync = RateSync(db, tariff_service, RateSyncConfig(reconnect_interval=0))
+
+    rate_sync.start()
+    await asyncio.sleep(0.01)
+    assert applied == [(CHANGES[:1], True), (CHANGES[1:], False)]
+
+    # После загрузки свои уведомления пропускаются
+    db.notify(rate_change_payloads(CHANGES[1:])[0])
+    db.notify(rate_change_payloads(CHANGES[1:], origin="replica")[0])
+    assert applied[2:] == [(CHANGES[1:], True)]
+
+    # После обрыва соединения снимок загружается заново
+    db.close()
+    await asyncio.sleep(0.01)
+    assert db.connections == 2
+    assert tariff_service.load_rate_index.await_count == 2
+    await rate_sync.stop()
+
+
+@pytest.mark.asyncio
+async def test_rate_sync_without_listen():
+    db = FakeListenDb()
+    tariff_service = MagicMock()
+    tariff_service.load_rate_index = AsyncMock()
+    rate_sync = RateSync(db, tariff_service, RateSyncConfig(listen=False))
+
+    rate_sync.start()
+    await asyncio.sleep(0.01)
+
+    tariff_service.load_rate_index.assert_awaited_once()
+    assert db.connections == 0
+    await rate_sync.stop()
+
+
+async def empty_rates():
+    return
+    yield
+
+
+@pytest.mark.asyncio
+async def test_own_notification_keeps_recent_imports(
+    tariff_service_mock,
+    tariff_repository_mock,
+):
+    tariff_repository_mock.upsert_tariffs.return_value = [
+        TariffUpsertRow(date(2023, 10, 1), "type1", 0.5, inserted=True),
+    ]
+    tariff_repository_mock.iter_rates = empty_rates
+    tariff_data = {date(2023, 10, 1): [TariffBase(category_type="type1", rate=0.5)]}
+    db = FakeListenDb()
+    rate_sync = RateSync(db, tariff_service_mock, RateSyncConfig())
+    rate_sync.start()
+    await asyncio.sleep(0.01)
+    assert tariff_service_mock._rate_index.loaded
+
+    await tariff_service_mock.create_tariff(tariff_data, ImportMode.UPSERT)
+    # Своё уведомление об этой записи приходит после ответа
+    db.notify(rate_change_payloads([(date(2023, 10, 1), "type1", 0.5)])[0])
+    retry = await tariff_service_mock.create_tariff(tariff_data, ImportMode.UPSERT)
+
+    assert retry.duplicate
+    tariff_repository_mock.upsert_tariffs.assert_awaited_once()
+
+    # Изменение другой реплики сбрасывает реестр
+    db.notify(
+        rate_change_payloads([(date(2023, 10, 1), "type1", 0.6)], origin="replica")[0],
+    )
+    retry = await tariff_service_mock.create_tariff(tariff_data, ImportMode.UPSERT)
+
+    assert not retry.duplicate
+    assert tariff_repository_mock.upsert_tariffs.await_count == 2
+    await rate_sync.stop()
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+
+from app.kafka.messages import create_tariff_change_message
+from app.models.action_type import ActionType
+from app.models.import_mode import ImportMode
+from app.models.tariff import TariffBase, TariffDeltaSummary
+from app.repositories.tariff_repository import TariffUpsertRow
+
+TARIFF_DATA = {
+    date(2023, 10, 1): [
+        TariffBase(category_type="type1", rate=0.5),
+        TariffBase(category_type="type2", rate=0.3),
+        TariffBase(category_type="type3", rate=0.2),
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_apply_tariff_delta(
+    tariff_service_mock,
+    tariff_repository_mock,
+    rate_cache,
+    rate_index,
+):
+    tariff_repository_mock.apply_tariff_delta.return_value = (
+        [
+            TariffUpsertRow(date(2023, 10, 1), "type1", 0.5, inserted=False),
+            TariffUpsertRow(date(2023, 10, 1), "type3", 0.2, inserted=True),
+        ],
+        [(date(2023, 10, 1), "type4")],
+    )
+    rate_index.upsert(date(2023, 10, 1), "type4", 0.9)
+    rate_cache.put((date(2023, 10, 1), "type4"), 0.9, rate_cache.generation)
+
+    summary = await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.DELTA)
+
+    tariff_repository_mock.apply_tariff_delta.assert_awaited_once_with(TARIFF_DATA)
+    tariff_repository_mock.add_tariffs_bulk.assert_not_called()
+    assert summary == TariffDeltaSummary(inserted=1, updated=1, removed=1, unchanged=1)
+    assert rate_cache.get((date(2023, 10, 1), "type4")) is None
+    assert rate_index.as_of("type4", date(2023, 10, 1)) is None
+    assert rate_index.as_of("type3", date(2023, 10, 1)) == (date(2023, 10, 1), 0.2)
+
+
+@pytest.mark.asyncio
+async def test_apply_tariff_delta_db_error(tariff_service_mock, tariff_repository_mock):
+    tariff_repository_mock.apply_tariff_delta.side_effect = OperationalError(
+        "DELETE",
+        {},
+        Exception("connection lost"),
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.DELTA)
+    assert exc_info.value.status_code == 500
+
+
+def test_create_tariff_change_message():
+    message = create_tariff_change_message(
+        ActionType.TARIFF_CATEGORY_REMOVED,
+        date(2023, 10, 1),
+        "type1",
+    )
+
+    assert message["action"] == "tariff_category_removed"
+    assert message["published_at"] == "2023-10-01"
+    assert message["category_type"] == "type1"
+    assert message["rate"] is None
@@ -0,0 +1,120 @@
+import json
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+
+from app.services.tariff_parse_pool import (
+    split_by_date,
+    TARIFF_FILE_ADAPTER,
+    TariffParsePool,
+)
+from app.services.tariff_service import TariffFileProcessor
+from app.settings import TariffImportConfig
+from tests.utils import load_json
+
+
+def tariff_file(indent: int | None = None) -> bytes:
+    data = load_json("mocked_data/tariffs_upload.json")
+    return json.dumps(data, indent=indent).encode()
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("shards", [1, 2, 3, 10])
+def test_split_by_date(indent, shards):
+    contents = tariff_file(indent)
+
+    parts = split_by_date(contents, shards)
+
+    assert 1 <= len(parts) <= shards
+    merged = {}
+    for part in parts:
+        merged.update(TARIFF_FILE_ADAPTER.validate_json(part))
+    assert merged == TARIFF_FILE_ADAPTER.validate_json(contents)
+
+
+def test_should_offload():
+    assert not TariffParsePool(TariffImportConfig()).should_offload(1 << 30)
+
+    pool = TariffParsePool(
+        TariffImportConfig(parse_processes=2, parse_offload_bytes=1024),
+    )
+    assert not pool.should_offload(1023)
+    assert pool.should_offload(1024)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = TariffParsePool(
+        TariffImportConfig(parse_processes=2, parse_offload_bytes=1),
+    )
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_parse_in_pool(pool):
+    contents = tariff_file()
+
+    assert pool.should_offload(len(contents))
+    assert await TariffFileProcessor.process_file_in_pool(
+        contents,
+        pool,
+    ) == TariffFileProcessor.process_file(contents)
+
+
+@pytest.mark.asyncio
+async def test_parse_in_pool_split_inside_value(pool):
+    # Ключ-дата внутри лишнего поля тарифа: граница части попадает внутрь
+    # значения, и файл разбирается целиком
+    tariffs = [{"category_type": f"type{number}", "rate": 0.1} for number in range(10)]
+    tariffs.append(
+        {"category_type": "Other", "rate": 0.01, "extra": {"2020-07-02": []}}
+    )
+    contents = json.dumps({"2020-06-01": [], "2020-07-01": tariffs}).encode()
+
+    first, _ = split_by_date(contents, 2)
+    with pytest.raises(ValidationError):
+        TARIFF_FILE_ADAPTER.validate_json(first)
+
+    assert await pool.parse(contents) == TariffFileProcessor.process_file(contents)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "contents, detail",
+    [
+        (b'{"2020-06-01": [], "2020-07-01": [', "Invalid JSON format"),
+        (
+            b'{"2020-06-01": [], "2020-07-01": [{"category_type": "a", "rate": 2}]}',
+            "Invalid tariff file: 2020-07-01.0.rate: "
+            "Input should be less than or equal to 1",
+        ),
+    ],
+)
+async def test_parse_in_pool_invalid(pool, contents, detail):
+    with pytest.raises(HTTPException) as exc_info:
+        await TariffFileProcessor.process_file_in_pool(contents, pool)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == detail
+
+
+@pytest.mark.asyncio
+async def test_upload_tariff_offloads_large_files(
+    tariff_service_mock,
+    parse_pool,
+    import_config,
+):
+    import_config.parse_processes = 2
+    import_config.parse_offload_bytes = 1
+    tariff_service_mock.create_tariff = AsyncMock()
+
+    with patch.object(parse_pool, "parse", wraps=parse_pool.parse) as parse:
+        await tariff_service_mock.upload_tariff(UploadFile(BytesIO(tariff_file())))
+
+    parse.assert_awaited_once()
+    tariffs_data = tariff_service_mock.create_tariff.call_args.args[0]
+    assert tariffs_data == TariffFileProcessor.process_file(tariff_file())
@@ -0,0 +1,104 @@
+import json
+from datetime import date
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.tariff_stream_parser import TariffStreamParser
+from tests.utils import load_json
+
+
+async def collect(parser: TariffStreamParser) -> list:
+    return [group async for group in parser.groups()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 64 * 1024])
+async def test_stream_parser_groups(chunk_size):
+    contents = json.dumps(load_json("mocked_data/tariffs_upload.json"), indent=4)
+    parser = TariffStreamParser(
+        UploadFile(BytesIO(contents.encode())),
+        chunk_size=chunk_size,
+    )
+
+    groups = await collect(parser)
+
+    assert [published_at for published_at, _ in groups] == [
+        date(2020, 6, 1),
+        date(2020, 7, 1),
+    ]
+    assert [tariff.rate for tariff in groups[0][1]] == [0.04, 0.01]
+    assert groups[1][1][0].category_type == "Стекло"
+    assert parser.bytes_read == len(contents.encode())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "contents",
+    [
+        b"",
+        b"[]",
+        b'{"2020-06-01": [{"category_type": "Glass", "rate": 0.04}',
+        b'{"2020-06-01": [{"category_type": "Glass", "rate": 4}]}',
+        b'{"not a date": []}',
+        b"{} {}",
+    ],
+)
+async def test_stream_parser_invalid(contents):
+    parser = TariffStreamParser(UploadFile(BytesIO(contents)), chunk_size=4)
+    with pytest.raises(ValueError):
+        await collect(parser)
+
+
+@pytest.mark.asyncio
+async def test_upload_tariff_stream(tariff_service_mock):
+    tariff_service_mock._tariff_repo.add_tariffs_bulk.side_effect = lambda data: {
+        published_at: uuid4() for published_at in data
+    }
+    contents = json.dumps(load_json("mocked_data/tariffs_upload.json")).encode()
+
+    summary = await tariff_service_mock.upload_tariff_stream(
+        UploadFile(BytesIO(contents), filename="tariffs.json"),
+    )
+
+    assert summary.dates == 2
+    assert summary.tariffs == 3
+    # batch_rows=2 в фикстуре: каждая дата уходит отдельной пачкой
+    assert tariff_service_mock._tariff_repo.add_tariffs_bulk.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_tariff_stream_invalid(tariff_service_mock):
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.upload_tariff_stream(
+            UploadFile(BytesIO(b"{"), filename="tariffs.json"),
+        )
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_upload_tariff_stream_reports_imported_on_error(tariff_service_mock):
+    tariff_service_mock._tariff_repo.add_tariffs_bulk.side_effect = lambda data: {
+        published_at: uuid4() for published_at in data
+    }
+    contents = json.dumps(
+        {
+            "2023-10-01": [
+                {"category_type": "type1", "rate": 0.5},
+                {"category_type": "type2", "rate": 0.3},
+            ],
+            "2023-11-01": [{"category_type": "type1", "rate": 5}],
+        },
+    ).encode()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.upload_tariff_stream(
+            UploadFile(BytesIO(contents), filename="tariffs.json"),
+        )
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail["message"].startswith("Invalid tariff file")
+    # Первая дата записана отдельной пачкой до ошибки
+    assert exc_info.value.detail["imported"] == {"dates": 1, "tariffs": 2}
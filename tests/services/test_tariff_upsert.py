@@ -0,0 +1,148 @@
+import hashlib
+from datetime import date
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi import UploadFile
+from prometheus_client import REGISTRY
+
+from app.models.import_mode import ImportMode
+from app.models.tariff import TariffBase, TariffUpsertSummary
+from app.repositories.tariff_repository import TariffUpsertRow
+from app.services.recent_imports import RecentImports
+
+TARIFF_DATA = {
+    date(2023, 10, 1): [
+        TariffBase(category_type="type1", rate=0.5),
+        TariffBase(category_type="type2", rate=0.3),
+    ],
+    date(2023, 11, 1): [TariffBase(category_type="type1", rate=0.4)],
+}
+TARIFF_FILE = (
+    b'{"2023-10-01": [{"category_type": "type1", "rate": 0.5}, '
+    b'{"category_type": "type2", "rate": 0.3}], '
+    b'"2023-11-01": [{"category_type": "type1", "rate": 0.4}]}'
+)
+
+
+def duplicates() -> float:
+    return REGISTRY.get_sample_value("tariff_duplicate_imports_total") or 0.0
+
+
+@pytest.fixture
+def upsert_mock(tariff_repository_mock):
+    upsert = tariff_repository_mock.upsert_tariffs
+    upsert.return_value = [
+        TariffUpsertRow(date(2023, 10, 1), "type1", 0.5, inserted=True),
+        TariffUpsertRow(date(2023, 11, 1), "type1", 0.4, inserted=False),
+    ]
+    return upsert
+
+
+@pytest.mark.asyncio
+async def test_upsert_summary(tariff_service_mock, upsert_mock, rate_cache, rate_index):
+    rate_cache.put((date(2023, 11, 1), "type1"), 0.9, rate_cache.generation)
+
+    summary = await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.UPSERT)
+
+    upsert_mock.assert_awaited_once_with(TARIFF_DATA)
+    assert (summary.inserted, summary.updated, summary.unchanged) == (1, 1, 1)
+    assert not summary.duplicate
+    assert rate_cache.get((date(2023, 11, 1), "type1")) is None
+    assert rate_index.as_of("type1", date(2023, 11, 1)) == (date(2023, 11, 1), 0.4)
+
+
+@pytest.mark.asyncio
+async def test_upsert_counts_changed_rows(tariff_service_mock, upsert_mock):
+    labels = {"mode": "upsert"}
+    before = REGISTRY.get_sample_value("tariff_rows_ingested_total", labels) or 0.0
+
+    await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.UPSERT)
+
+    after = REGISTRY.get_sample_value("tariff_rows_ingested_total", labels)
+    assert after - before == 2
+
+
+@pytest.mark.asyncio
+async def test_upsert_duplicate_is_skipped(tariff_service_mock, upsert_mock):
+    first = await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.UPSERT)
+    before = duplicates()
+
+    second = await tariff_service_mock.create_tariff(
+        {published_at: list(tariffs) for published_at, tariffs in TARIFF_DATA.items()},
+        ImportMode.UPSERT,
+    )
+
+    upsert_mock.assert_awaited_once()
+    assert second == TariffUpsertSummary(
+        content_hash=first.content_hash,
+        inserted=0,
+        updated=0,
+        unchanged=3,
+        duplicate=True,
+    )
+    assert duplicates() - before == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_after_other_change_is_applied(tariff_service_mock, upsert_mock):
+    tariff_service_mock._tariff_repo.add_tariffs_with_date_accession.return_value = [
+        SimpleNamespace(date_accession_id=uuid4()),
+    ]
+
+    await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.UPSERT)
+    await tariff_service_mock.create_tariff(
+        {date(2023, 10, 1): [TariffBase(category_type="type3", rate=0.1)]},
+    )
+    summary = await tariff_service_mock.create_tariff(TARIFF_DATA, ImportMode.UPSERT)
+
+    assert upsert_mock.await_count == 2
+    assert not summary.duplicate
+
+
+@pytest.mark.asyncio
+async def test_upload_upsert_duplicate_is_not_parsed(tariff_service_mock, upsert_mock):
+    first = await tariff_service_mock.upload_tariff(
+        UploadFile(BytesIO(TARIFF_FILE)),
+        ImportMode.UPSERT,
+    )
+    assert first.content_hash == hashlib.sha256(TARIFF_FILE).hexdigest()
+
+    with patch(
+        "app.services.tariff_service.TariffFileProcessor.process_file",
+    ) as process_file:
+        second = await tariff_service_mock.upload_tariff(
+            UploadFile(BytesIO(TARIFF_FILE)),
+            ImportMode.UPSERT,
+        )
+
+    process_file.assert_not_called()
+    upsert_mock.assert_awaited_once()
+    assert second.duplicate
+
+
+def test_recent_imports_lru_and_ttl():
+    summaries = [
+        TariffUpsertSummary(
+            content_hash=str(uuid4()),
+            inserted=1,
+            updated=0,
+            unchanged=0,
+        )
+        for _ in range(3)
+    ]
+    with patch("app.services.recent_imports.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        recent_imports = RecentImports(max_size=2, ttl=10)
+        for summary in summaries:
+            recent_imports.put(summary)
+
+        assert recent_imports.get(summaries[0].content_hash) is None
+        assert recent_imports.get(summaries[2].content_hash) == summaries[2]
+
+        monotonic.return_value = 110.0
+        assert recent_imports.get(summaries[2].content_hash) is None
+        assert len(recent_imports) == 1
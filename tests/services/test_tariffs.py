@@ -1,12 +1,20 @@
+from collections import namedtuple
 from datetime import date
-from unittest.mock import AsyncMock
+from types import SimpleNamespace
 from uuid import uuid4
 
+import orjson
 import pytest
 from fastapi import HTTPException
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import IntegrityError
 
+from app.models.export_format import ExportFormat
+from app.models.import_mode import ImportMode
 from app.models.tariff import InsuranceCostRequest, TariffBase, TariffResponse
-from app.orm_models import DateAccession, Tariff
+from app.orm_models import Tariff
+from app.services.tariff_service import TariffFileProcessor
+from tests.utils import load_json
 
 
 @pytest.mark.asyncio
@@ -115,12 +123,12 @@ async def test_calculate_insurance_cost(
     expected_exception,
 ):
     if expected_exception is None:
-        tariff_service_mock._tariff_repo.get_tariff.return_value = Tariff(
-            rate=0.5 if request_data.category_type == "type1" else 0.75,
+        tariff_service_mock._tariff_repo.get_rate.return_value = (
+            0.5 if request_data.category_type == "type1" else 0.75
         )
 
     else:
-        tariff_service_mock._tariff_repo.get_tariff.side_effect = expected_exception
+        tariff_service_mock._tariff_repo.get_rate.side_effect = expected_exception
 
     if expected_exception:
         with pytest.raises(HTTPException) as exc_info:
@@ -157,102 +165,308 @@ async def test_get_tariff_by_id(
         assert response == existing_tariff
 
 
+TARIFF_ID = uuid4()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "tariff_id, new_tariff, existing_tariff, expected_response, expected_exception",
+    "updated_row, expected_response, expected_status",
     [
         (
-            uuid4(),
-            TariffBase(category_type="type1", rate=0.6),
-            Tariff(
-                id=uuid4(),
+            SimpleNamespace(
+                id=TARIFF_ID,
+                published_at=date(2023, 10, 1),
+                old_category_type="type1",
                 category_type="type1",
-                rate=0.5,
-                date_accession=DateAccession(published_at=date(2023, 10, 1)),
+                rate=0.6,
+            ),
+            TariffResponse(
+                id=TARIFF_ID,
+                published_at=date(2023, 10, 1),
+                tariffs=[TariffBase(category_type="type1", rate=0.6)],
             ),
-            None,
             None,
         ),
+        (None, None, 404),
+    ],
+)
+async def test_update_tariff(
+    tariff_service_mock,
+    updated_row,
+    expected_response,
+    expected_status,
+):
+    new_tariff = TariffBase(category_type="type1", rate=0.6)
+    tariff_service_mock._tariff_repo.update_tariff.return_value = updated_row
+
+    if expected_status:
+        with pytest.raises(HTTPException) as exc_info:
+            await tariff_service_mock.update_tariff(TARIFF_ID, new_tariff)
+        assert exc_info.value.status_code == expected_status
+    else:
+        response = await tariff_service_mock.update_tariff(TARIFF_ID, new_tariff)
+        assert response == expected_response
+
+    tariff_service_mock._tariff_repo.update_tariff.assert_awaited_once_with(
+        TARIFF_ID,
+        new_tariff,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "deleted_row, expected_response, expected_status",
+    [
         (
-            uuid4(),
-            TariffBase(category_type="type1", rate=0.6),
-            None,
+            SimpleNamespace(
+                id=TARIFF_ID,
+                published_at=date(2023, 10, 1),
+                category_type="type1",
+            ),
+            {"message": f"Tariff with ID {TARIFF_ID} has been deleted."},
             None,
-            HTTPException(status_code=404, detail="Tariff not found"),
         ),
+        (None, None, 404),
     ],
 )
-async def test_update_tariff(
+async def test_delete_tariff(
     tariff_service_mock,
-    tariff_id,
-    new_tariff,
-    existing_tariff,
+    deleted_row,
     expected_response,
-    expected_exception,
+    expected_status,
 ):
-    tariff_service_mock.get_tariff_by_id = AsyncMock(return_value=existing_tariff)
+    tariff_service_mock._tariff_repo.delete_tariff.return_value = deleted_row
 
-    if expected_exception is None:
-        updated_tariff = Tariff(
-            id=tariff_id,
-            category_type=new_tariff.category_type,
-            rate=new_tariff.rate,
-        )
-        tariff_service_mock._tariff_repo.update_tariff.return_value = updated_tariff
+    if expected_status:
+        with pytest.raises(HTTPException) as exc_info:
+            await tariff_service_mock.delete_tariff(TARIFF_ID)
+        assert exc_info.value.status_code == expected_status
+    else:
+        response = await tariff_service_mock.delete_tariff(TARIFF_ID)
+        assert response == expected_response
 
-        expected_response = TariffResponse(
-            id=tariff_id,
+
+@pytest.mark.asyncio
+async def test_calculate_insurance_cost_batch(tariff_service_mock):
+    tariff_service_mock._tariff_repo.get_rates.return_value = {
+        (date(2023, 10, 1), "type1"): 0.5,
+        (date(2023, 10, 1), "type2"): 0.75,
+    }
+    requests = [
+        InsuranceCostRequest(
+            declared_value=value,
+            category_type=category_type,
             published_at=date(2023, 10, 1),
-            tariffs=[TariffBase(category_type="type1", rate=0.6)],
         )
-    else:
-        tariff_service_mock._tariff_repo.update_tariff.side_effect = expected_exception
+        for value, category_type in [(1000, "type1"), (1000, "type2"), (10, "type1")]
+    ]
 
-    if expected_exception:
-        with pytest.raises(HTTPException) as exc_info:
-            await tariff_service_mock.update_tariff(tariff_id, new_tariff)
-        assert exc_info.value.status_code == expected_exception.status_code
+    response = await tariff_service_mock.calculate_insurance_cost_batch(requests)
+
+    assert [item.insurance_cost for item in response] == [500.0, 750.0, 5.0]
+    tariff_service_mock._tariff_repo.get_rates.assert_awaited_once()
+    tariff_service_mock._kafka_producer.send_message.assert_awaited_once()
+    message = tariff_service_mock._kafka_producer.send_message.await_args.args[0]
+    assert message["items"] == 3
+
+
+@pytest.mark.asyncio
+async def test_calculate_insurance_cost_batch_not_found(tariff_service_mock):
+    tariff_service_mock._tariff_repo.get_rates.return_value = {}
+    request = InsuranceCostRequest(
+        declared_value=1000,
+        category_type="type3",
+        published_at=date(2023, 10, 1),
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.calculate_insurance_cost_batch([request])
+    assert exc_info.value.status_code == 404
+    tariff_service_mock._kafka_producer.send_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_tariff_bulk(tariff_service_mock):
+    accession_ids = {date(2023, 10, 1): uuid4(), date(2023, 11, 1): uuid4()}
+    tariff_service_mock._tariff_repo.add_tariffs_bulk.return_value = accession_ids
+    tariff_data = {
+        date(2023, 10, 1): [TariffBase(category_type="type1", rate=0.5)],
+        date(2023, 11, 1): [
+            TariffBase(category_type="type1", rate=0.4),
+            TariffBase(category_type="type2", rate=0.3),
+        ],
+    }
+
+    response = await tariff_service_mock.create_tariff(tariff_data, ImportMode.BULK)
+
+    tariff_service_mock._tariff_repo.add_tariffs_bulk.assert_awaited_once_with(
+        tariff_data,
+    )
+    tariff_service_mock._tariff_repo.add_tariffs_with_date_accession.assert_not_called()
+    assert [item.id for item in response] == list(accession_ids.values())
+    assert len(response[1].tariffs) == 2
+    # события пишутся в outbox внутри репозитория
+    tariff_service_mock._kafka_producer.send_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        (ImportMode.DEFAULT, []),
+        (ImportMode.BULK, []),
+        (ImportMode.UPSERT, {"inserted": 0, "updated": 0, "unchanged": 0}),
+        (ImportMode.DELTA, {"inserted": 0, "updated": 0, "removed": 0, "unchanged": 0}),
+    ],
+)
+async def test_create_tariff_empty(tariff_service_mock, mode, expected):
+    response = await tariff_service_mock.create_tariff({}, mode)
+
+    if isinstance(response, list):
+        assert response == expected
     else:
-        response = await tariff_service_mock.update_tariff(tariff_id, new_tariff)
-        assert response == expected_response
+        assert response.model_dump(include=set(expected)) == expected
+    repo = tariff_service_mock._tariff_repo
+    repo.add_tariffs_bulk.assert_not_called()
+    repo.upsert_tariffs.assert_not_called()
+    repo.apply_tariff_delta.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_tariff_duplicate_category(tariff_service_mock):
+    tariff_service_mock._tariff_repo.add_tariffs_with_date_accession.side_effect = (
+        IntegrityError("INSERT", {}, Exception("duplicate key"))
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.create_tariff(
+            {date(2023, 10, 1): [TariffBase(category_type="type1", rate=0.5)]},
+        )
+    assert exc_info.value.status_code == 409
+
 
+TariffRow = namedtuple("TariffRow", ["id", "published_at", "category_type", "rate"])
 
-GLOBAL_TARIFF_ID = uuid4()
+
+def tariff_row(published_at: date, category_type: str) -> TariffRow:
+    return TariffRow(TARIFF_ID, published_at, category_type, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_list_tariffs_next_cursor(tariff_service_mock):
+    rows = [tariff_row(date(2023, 10, 1), "type1"), tariff_row(date(2023, 10, 2), "a")]
+    tariff_service_mock._tariff_repo.list_tariffs.return_value = rows
+
+    page = await tariff_service_mock.list_tariffs(None, None, None, None, 2)
+    assert [item.category_type for item in page.items] == ["type1", "a"]
+    assert page.next_cursor == f"2023-10-02_{TARIFF_ID}"
+
+    await tariff_service_mock.list_tariffs(None, None, None, page.next_cursor, 2)
+    tariff_service_mock._tariff_repo.list_tariffs.assert_awaited_with(
+        None,
+        None,
+        None,
+        (date(2023, 10, 2), TARIFF_ID),
+        2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_tariffs_invalid_cursor(tariff_service_mock):
+    with pytest.raises(HTTPException) as exc_info:
+        await tariff_service_mock.list_tariffs(None, None, None, "bad", 10)
+    assert exc_info.value.status_code == 400
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "existing_tariff, expected_response, expected_exception",
+    "export_format, expected",
     [
         (
-            Tariff(id=GLOBAL_TARIFF_ID, category_type="type1", rate=0.5),
-            {"message": f"Tariff with ID {GLOBAL_TARIFF_ID} has been deleted."},
-            None,
+            ExportFormat.CSV,
+            "id,published_at,category_type,rate\r\n"
+            f"{TARIFF_ID},2023-10-01,type1,0.5\r\n",
         ),
         (
+            ExportFormat.NDJSON,
+            f'{{"id":"{TARIFF_ID}","published_at":"2023-10-01",'
+            '"category_type":"type1","rate":0.5}\n',
+        ),
+    ],
+)
+async def test_export_tariffs(tariff_service_mock, export_format, expected):
+    async def iter_tariffs(*args):
+        yield [tariff_row(date(2023, 10, 1), "type1")]
+
+    tariff_service_mock._tariff_repo.iter_tariffs = iter_tariffs
+
+    chunks = [
+        chunk
+        async for chunk in tariff_service_mock.export_tariffs(
             None,
             None,
-            HTTPException(status_code=404, detail="Tariff not found"),
+            None,
+            export_format,
+        )
+    ]
+    assert b"".join(chunks).decode() == expected
+
+
+@pytest.mark.asyncio
+async def test_tariff_operations_are_measured(tariff_service_mock):
+    def sample(name: str, labels: dict[str, str]) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    calls = sample(
+        "tariff_service_seconds_count",
+        {"operation": "create_tariff"},
+    )
+    rows = sample("tariff_rows_ingested_total", {"mode": "bulk"})
+    tariff_service_mock._tariff_repo.add_tariffs_bulk.return_value = {
+        date(2023, 10, 1): uuid4(),
+    }
+
+    await tariff_service_mock.create_tariff(
+        {date(2023, 10, 1): [TariffBase(category_type="type1", rate=0.5)] * 3},
+        ImportMode.BULK,
+    )
+
+    assert sample(
+        "tariff_service_seconds_count",
+        {"operation": "create_tariff"},
+    ) == (calls + 1)
+    assert sample("tariff_rows_ingested_total", {"mode": "bulk"}) == rows + 3
+
+
+def test_process_file():
+    contents = orjson.dumps(load_json("mocked_data/tariffs_upload.json"))
+
+    tariffs = TariffFileProcessor.process_file(contents)
+
+    assert tariffs
+    assert all(isinstance(published_at, date) for published_at in tariffs)
+    assert all(
+        isinstance(tariff, TariffBase)
+        for tariff_list in tariffs.values()
+        for tariff in tariff_list
+    )
+
+
+@pytest.mark.parametrize(
+    "contents, detail",
+    [
+        (b'{"2023-10-01": [', "Invalid JSON format"),
+        (b"[]", "Invalid tariff file: <root>: Input should be an object"),
+        (
+            b'{"2023-10-01": [{"category_type": "type1", "rate": 2}]}',
+            "Invalid tariff file: 2023-10-01.0.rate: "
+            "Input should be less than or equal to 1",
         ),
     ],
 )
-async def test_delete_tariff(
-    tariff_service_mock,
-    existing_tariff,
-    expected_response,
-    expected_exception,
-):
-    tariff_service_mock.get_tariff_by_id = AsyncMock(return_value=existing_tariff)
+def test_process_file_invalid(contents, detail):
+    with pytest.raises(HTTPException) as exc_info:
+        TariffFileProcessor.process_file(contents)
 
-    if expected_exception is None:
-        tariff_service_mock._tariff_repo.delete_tariff = AsyncMock()
-    else:
-        tariff_service_mock._tariff_repo.delete_tariff.side_effect = expected_exception
-
-    if expected_exception:
-        with pytest.raises(HTTPException) as exc_info:
-            await tariff_service_mock.delete_tariff(GLOBAL_TARIFF_ID)
-        assert exc_info.value.status_code == expected_exception.status_code
-    else:
-        response = await tariff_service_mock.delete_tariff(GLOBAL_TARIFF_ID)
-        assert response == expected_response
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == detail
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import literal_column, select, text
+
+from app.utils.db import Db, DbConfig
+
+
+@pytest.mark.asyncio
+async def test_read_session_balances_replicas(tmp_path):
+    dsns = [f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in "abc"]
+    db = Db(DbConfig(dsn=dsns[0], replica_dsns=dsns[1:]))
+    try:
+        for name, engine in zip("abc", db._engines.values()):
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE origin (name TEXT)"))
+                await conn.execute(text(f"INSERT INTO origin VALUES ('{name}')"))
+
+        origins = []
+        for _ in range(4):
+            async with db.read_session() as session:
+                origins.append(await session.scalar(text("SELECT name FROM origin")))
+        async with db.get_session() as session:
+            primary = await session.scalar(text("SELECT name FROM origin"))
+        async with db.read_session(primary=True) as session:
+            primary_read = await session.scalar(text("SELECT name FROM origin"))
+    finally:
+        await db.shutdown()
+
+    assert origins == ["b", "c", "b", "c"]
+    assert primary == primary_read == "a"
+
+
+@pytest.mark.asyncio
+async def test_query_hook_reports_cache_hits(tmp_path):
+    db = Db(DbConfig(dsn=f"sqlite+aiosqlite:///{tmp_path / 'db'}.db"))
+    stats = []
+    db.add_query_hook(stats.append)
+    query = select(literal_column("1")).execution_options(query_name="one")
+    try:
+        for _ in range(2):
+            async with db.read_session() as session:
+                await session.execute(query)
+    finally:
+        await db.shutdown()
+
+    assert [(item.query, item.cache_hit) for item in stats] == [
+        ("one", False),
+        ("one", True),
+    ]
+    assert all(item.engine == "primary" and item.seconds >= 0 for item in stats)
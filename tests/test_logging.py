@@ -0,0 +1,92 @@
+import threading
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.models.tariff import InsuranceCostRequest
+from app.utils.logger_config import LogRateLimit, QueuedSink
+
+
+def dropped(sink: str, reason: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "log_records_dropped_total",
+            {"sink": sink, "reason": reason},
+        )
+        or 0.0
+    )
+
+
+def test_queued_sink_does_not_block():
+    taken, release = threading.Event(), threading.Event()
+    sent = []
+
+    def send(message: str) -> None:
+        taken.set()
+        release.wait()
+        sent.append(message)
+
+    before = dropped("slow", "queue_full")
+    sink = QueuedSink("slow", send, queue_size=2)
+    started = time.perf_counter()
+    sink("message 0")
+    taken.wait(1)
+    for number in range(1, 5):
+        sink(f"message {number}")
+    assert time.perf_counter() - started < 0.5
+
+    release.set()
+    sink.stop()
+    # Первое сообщение уже у потока, два в очереди, остальные отброшены
+    assert sent == ["message 0", "message 1", "message 2"]
+    assert dropped("slow", "queue_full") - before == 2
+
+
+def test_queued_sink_send_error():
+    def send(message: str) -> None:
+        raise ConnectionError(message)
+
+    before = dropped("failing", "send_error")
+    sink = QueuedSink("failing", send)
+    sink("message")
+    sink.stop()
+
+    assert dropped("failing", "send_error") - before == 1
+
+
+def test_log_rate_limit():
+    with patch("app.utils.logger_config.time.monotonic") as monotonic:
+        limit = LogRateLimit(per_second=2)
+        monotonic.return_value = 100.0
+        assert limit.acquire() == 0
+        assert limit.acquire() is None
+        assert limit.acquire() is None
+
+        monotonic.return_value = 100.5
+        assert limit.acquire() == 2
+        assert limit.acquire() is None
+
+    unlimited = LogRateLimit(per_second=None)
+    assert [unlimited.acquire() for _ in range(3)] == [0, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_calculate_logs_are_rate_limited(
+    tariff_service_mock,
+    tariff_repository_mock,
+):
+    tariff_repository_mock.get_rate.return_value = 0.5
+    request = InsuranceCostRequest(
+        declared_value=1000,
+        category_type="type1",
+        published_at=date(2023, 10, 1),
+    )
+
+    with patch("app.services.tariff_service.logger") as logger:
+        for _ in range(5):
+            await tariff_service_mock.calculate_insurance_cost(request)
+
+    assert logger.info.call_count == 1
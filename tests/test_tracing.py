@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.tracing import (
+    FileExporter,
+    InMemoryExporter,
+    shutdown_tracing,
+    traced,
+    TracedRoute,
+    tracer,
+)
+from tests.kafka.test_producer import make_producer
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    tracer.configure(exporter)
+    yield exporter
+    tracer.configure(None)
+
+
+def test_span_disabled():
+    with tracer.span("disabled") as span:
+        assert span is None
+        assert tracer.current_traceparent() is None
+
+
+@pytest.mark.asyncio
+async def test_nested_spans(exporter):
+    @traced("service")
+    async def operation() -> None:
+        with tracer.span("inner"):
+            pass
+
+    with tracer.span("outer") as outer:
+        await operation()
+    with pytest.raises(ZeroDivisionError):
+        with tracer.span("failed"):
+            1 / 0
+
+    inner, service, root, failed = exporter.spans
+    assert [span.name for span in exporter.spans] == [
+        "inner",
+        "service.operation",
+        "outer",
+        "failed",
+    ]
+    assert service.parent_id == root.span_id == outer.span_id
+    assert inner.parent_id == service.span_id
+    assert inner.trace_id == service.trace_id == root.trace_id
+    assert root.parent_id is None
+    assert failed.status == "error"
+    assert tracer.current_traceparent() is None
+
+
+def test_route_continues_incoming_trace(exporter):
+    router = APIRouter(route_class=TracedRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int) -> int:
+        return item_id
+
+    server = FastAPI()
+    server.include_router(router, prefix="/v1")
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = TestClient(server).get(
+        "/v1/items/1",
+        headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+    )
+
+    assert response.status_code == 200
+    (span,) = exporter.spans
+    assert span.name == "GET /v1/items/{item_id}"
+    assert span.trace_id == trace_id
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert span.attributes["http.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_producer_propagates_traceparent(tmp_path, exporter):
+    producer = make_producer(tmp_path)
+    with tracer.span("request") as span:
+        await producer.send_message({"number": 1})
+    await producer.stop()
+
+    call = producer.producer.send.await_args_list[0]
+    assert call.kwargs["headers"] == [("traceparent", span.traceparent.encode())]
+
+
+@pytest.mark.asyncio
+async def test_file_exporter_writes_in_background(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer.configure(FileExporter(str(path)))
+    for name in ("first", "second"):
+        with tracer.span(name, number=1):
+            pass
+    await shutdown_tracing()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["first", "second"]
+    assert spans[0]["attributes"] == {"number": 1}
+    assert not tracer.enabled